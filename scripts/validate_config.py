@@ -5,15 +5,104 @@ Validate MCP configuration files before committing.
 Usage:
     python scripts/validate_config.py MCP-list/my-mcp/config.txt
     python scripts/validate_config.py  # validates all configs
+
+Exits with status 1 if any configuration is invalid.
 """
 
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.config_parser import parse_config_file, find_mcp_configs
+from src.utils import config_parser
+from src.utils.config_parser import parse_config_file
+
+# On-disk cache of parsed configs, keyed by parser version + mtime + content hash
+CACHE_FILE = Path(".mcp-config-cache.json")
+
+# Hash of the parser source, so cached parses are dropped whenever the parser
+# (or the option schema it defines) changes
+PARSER_VERSION = hashlib.sha1(Path(config_parser.__file__).read_bytes()).hexdigest()[:12]
+
+# Validate configs in a process pool when there are more than this many
+PARALLEL_THRESHOLD = 4
+
+
+def _load_cache() -> dict:
+    """Load the parsed-config cache, ignoring missing or corrupt files."""
+    try:
+        with open(CACHE_FILE, "r") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: dict) -> None:
+    """Atomically rewrite the parsed-config cache."""
+    tmp_file = CACHE_FILE.with_name(CACHE_FILE.name + ".tmp")
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: Could not write config cache {CACHE_FILE}: {e}")
+
+
+def _iter_mcp_dirs(base_path: str = "MCP-list") -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield (mcp_name, config_path) for every MCP directory with a config.txt.
+
+    Uses os.scandir so directory type checks come from the directory entry itself
+    instead of an extra stat() call per entry.
+    """
+    try:
+        it = os.scandir(base_path)
+    except FileNotFoundError:
+        return
+
+    with it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(entry.path) as mcp_it:
+                for mcp_entry in mcp_it:
+                    if mcp_entry.name == "config.txt" and mcp_entry.is_file():
+                        yield entry.name, f"{base_path}/{entry.name}/config.txt"
+                        break
+
+
+def parse_config_cached(config_path: str, cache: dict) -> dict:
+    """
+    Parse a configuration file, reusing the cached result if the file is unchanged.
+
+    Only successfully parsed configurations are stored in the cache, so invalid
+    files are re-parsed (and re-reported) on every run. Malformed cache entries
+    are treated as misses.
+    """
+    path = Path(config_path)
+    mtime_ns = os.stat(path).st_mtime_ns
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    key = f"{PARSER_VERSION}:{mtime_ns}:{digest}"
+
+    entry = cache.get(config_path)
+    if (
+        isinstance(entry, dict)
+        and entry.get("key") == key
+        and isinstance(entry.get("config"), dict)
+        and entry["config"].get("source")
+    ):
+        return entry["config"]
+
+    config = parse_config_file(config_path)
+    cache[config_path] = {"key": key, "config": config}
+    return config
 
 
 def validate_single_config(config_path: str) -> bool:
@@ -39,30 +128,68 @@ def validate_single_config(config_path: str) -> bool:
         return False
 
 
+def _validate_entry(
+    item: Tuple[str, str, Optional[dict]],
+) -> Tuple[str, bool, List[str], Optional[dict]]:
+    """
+    Validate one MCP configuration without printing.
+
+    Runs in a worker process, so it takes and returns the cache entry for the
+    config instead of mutating the shared cache.
+
+    Returns:
+        Tuple of (mcp_name, is_valid, output_lines, cache_entry)
+    """
+    mcp_name, config_path, entry = item
+    cache = {config_path: entry} if entry else {}
+    lines = []
+
+    try:
+        config = parse_config_cached(config_path, cache)
+        lines.append(f"✅ {mcp_name}")
+        lines.append(f"   Source: {config['source']}")
+        if config['ref']:
+            lines.append(f"   Ref: {config['ref']}")
+        valid = True
+    except Exception as e:
+        lines.append(f"❌ {mcp_name}: {e}")
+        valid = False
+
+    return mcp_name, valid, lines, cache.get(config_path)
+
+
 def validate_all_configs() -> bool:
     """Validate all MCP configurations."""
-    configs = find_mcp_configs()
+    config_paths = dict(sorted(_iter_mcp_dirs()))
     
-    if not configs:
+    if not config_paths:
         print("No MCP configurations found in MCP-list/")
         return True
     
-    print(f"Found {len(configs)} MCP configuration(s):\n")
+    print(f"Found {len(config_paths)} MCP configuration(s):\n")
+    
+    cache = _load_cache()
+    items = [(name, path, cache.get(path)) for name, path in config_paths.items()]
+    
+    # Process startup is only worth paying for larger config trees
+    if len(items) > PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(_validate_entry, items, chunksize=8))
+    else:
+        results = list(map(_validate_entry, items))
     
     all_valid = True
-    for mcp_name, config in configs.items():
-        config_path = f"MCP-list/{mcp_name}/config.txt"
-        
-        try:
-            print(f"✅ {mcp_name}")
-            print(f"   Source: {config['source']}")
-            if config['ref']:
-                print(f"   Ref: {config['ref']}")
-        except Exception as e:
-            print(f"❌ {mcp_name}: {e}")
-            all_valid = False
-        
+    new_cache = {}
+    for mcp_name, valid, lines, entry in results:
+        for line in lines:
+            print(line)
         print()
+        
+        all_valid = all_valid and valid
+        if entry:
+            new_cache[config_paths[mcp_name]] = entry
+    
+    _save_cache(new_cache)
     
     return all_valid
 
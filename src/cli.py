@@ -4,18 +4,29 @@ Command-line interface for MCP Malware Sandbox.
 
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
-from rich.console import Console
 
-from src.orchestrator.main import MCPSandboxOrchestrator
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from src.inspector.static_scanner import StaticScanner
 
 app = typer.Typer(
     name="mcp-sandbox", help="Comprehensive MCP malware sandbox with layered security architecture"
 )
-console = Console()
+
+
+@lru_cache(maxsize=None)
+def _console() -> "Console":
+    """Create the rich console on first use to keep CLI start-up fast."""
+    from rich.console import Console
+
+    return Console()
 
 
 @app.command()
@@ -69,6 +80,7 @@ def analyze(
         mcp-sandbox analyze pypi:package-name
         mcp-sandbox analyze package-name==1.0.0
     """
+    console = _console()
     console.print("[bold cyan]MCP Malware Sandbox[/bold cyan]")
     console.print(f"Analyzing source: {source}\n")
 
@@ -76,6 +88,8 @@ def analyze(
     if not anthropic_key:
         anthropic_key = os.getenv("ANTHROPIC_API_KEY")
 
+    from src.orchestrator.main import MCPSandboxOrchestrator
+
     # Create orchestrator
     orchestrator = MCPSandboxOrchestrator(
         source_reference=source,
@@ -105,7 +119,12 @@ def analyze(
 
 
 @app.command()
-def scan(workspace: str = typer.Argument(..., help="Path to scan")) -> None:
+def scan(
+    workspace: str = typer.Argument(..., help="Path to scan"),
+    keep_report: bool = typer.Option(
+        False, "--keep-report", help="Also write the raw Trivy report to reports/trivy-report.json"
+    ),
+) -> None:
     """
     Run static analysis only (no container isolation).
 
@@ -113,12 +132,14 @@ def scan(workspace: str = typer.Argument(..., help="Path to scan")) -> None:
     """
     from src.inspector.static_scanner import StaticScanner
 
+    console = _console()
+
     console.print(f"[bold]Scanning: {workspace}[/bold]\n")
 
     scanner = StaticScanner(workspace)
 
-    # Run Trivy scan
-    result = scanner.scan_with_trivy()
+    # Run Trivy scan and permission checks concurrently
+    result, permissions = asyncio.run(_scan_all(scanner, keep_report))
 
     if result:
         console.print(f"\n[bold]Found {result.total_count} vulnerabilities:[/bold]")
@@ -127,20 +148,26 @@ def scan(workspace: str = typer.Argument(..., help="Path to scan")) -> None:
         console.print(f"  Medium: {result.medium_count}")
         console.print(f"  Low: {result.low_count}")
 
-    # Check permissions
-    permissions = scanner.check_permissions_manifest()
-
     if permissions.get("dangerous_permissions"):
         console.print("\n[yellow]Dangerous permissions:[/yellow]")
         for perm in permissions["dangerous_permissions"]:
             console.print(f"  - {perm}")
 
 
+async def _scan_all(scanner: "StaticScanner", keep_report: bool) -> tuple:
+    """Run the Trivy scan and the permissions manifest check concurrently."""
+    return await asyncio.gather(
+        scanner.scan_with_trivy(keep_report=keep_report),
+        asyncio.to_thread(scanner.check_permissions_manifest),
+    )
+
+
 @app.command()
 def build() -> None:
     """
     Build the sandbox Docker image.
     """
+    console = _console()
     import subprocess
 
     console.print("[bold]Building Docker sandbox image...[/bold]\n")
@@ -161,6 +188,7 @@ def setup() -> None:
     """
     Setup the sandbox environment (install dependencies, check tools).
     """
+    console = _console()
     console.print("[bold]Setting up MCP Malware Sandbox...[/bold]\n")
 
     # Check for required tools
@@ -171,13 +199,14 @@ def setup() -> None:
 
     missing = []
 
-    for cmd, name in required_tools.items():
-        try:
-            import subprocess
+    # Check all tools concurrently; map() keeps the output order stable
+    with ThreadPoolExecutor(max_workers=len(required_tools)) as executor:
+        results = list(executor.map(_check_tool, required_tools.items()))
 
-            subprocess.run([cmd, "--version"], capture_output=True, check=True)
+    for name, found in results:
+        if found:
             console.print(f"[green]✓ {name} found[/green]")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             console.print(f"[red]✗ {name} not found[/red]")
             missing.append(name)
 
@@ -196,9 +225,22 @@ def setup() -> None:
         console.print(f"[green]✓ Created directory: {d}[/green]")
 
 
+def _check_tool(tool: tuple[str, str]) -> tuple[str, bool]:
+    """Check whether a command-line tool is installed and runnable."""
+    import subprocess
+
+    cmd, name = tool
+    try:
+        subprocess.run([cmd, "--version"], capture_output=True, check=True, timeout=5)
+        return name, True
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return name, False
+
+
 @app.command()
 def version() -> None:
     """Show version information."""
+    console = _console()
     console.print("[bold cyan]MCP Malware Sandbox[/bold cyan]")
     console.print("Version: 0.1.0")
     console.print("A comprehensive security sandbox for MCP servers")
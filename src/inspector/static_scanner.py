@@ -3,17 +3,104 @@ Static analysis and dependency scanner for MCP servers.
 Integrates Trivy and OSV-Scanner to detect vulnerabilities.
 """
 
-import json
-import subprocess
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import AsyncIterable, BinaryIO, Dict, Iterable, List, Any, Optional
+from dataclasses import asdict, dataclass
 from enum import Enum
 
+import ahocorasick
+import ijson
+import orjson
 from rich.console import Console
 
+try:
+    import tomllib as _toml  # Python 3.11+
+except ImportError:
+    import tomli as _toml
+
 console = Console()
 
+# ijson prefix of the vulnerability records in a Trivy JSON report
+TRIVY_VULNERABILITIES_PREFIX = "Results.item.Vulnerabilities.item"
+
+# Seconds before a running Trivy scan is killed
+TRIVY_TIMEOUT = 300
+
+# Cached Trivy results live outside the scanned workspace so an untrusted
+# MCP server cannot ship its own "clean" results
+SCAN_CACHE_DIR = Path.home() / ".cache" / "mcp-sandbox" / "trivy"
+
+# Cache files kept before the least recently used are evicted; each scanned
+# workspace uses up to two (scan result and SBOM)
+SCAN_CACHE_MAX_FILES = 100
+
+# Reports the scanner writes into the workspace; left out of the cache key
+TRIVY_REPORT_NAME = "trivy-report.json"
+SBOM_NAME = "sbom.json"
+GENERATED_REPORTS = (TRIVY_REPORT_NAME, SBOM_NAME)
+
+# Chunk size used when hashing workspace files for the cache key
+HASH_CHUNK_SIZE = 1 << 20
+
+# Updated whenever Trivy downloads a new vulnerability database
+TRIVY_DB_METADATA = Path.home() / ".cache" / "trivy" / "db" / "metadata.json"
+
+# Leading package name of a requirement string (drops extras and version specifiers)
+_PKG_NAME_RE = re.compile(r"^\s*([A-Za-z0-9_.\-]+)")
+
+# Dangerous Node.js modules
+_DANGEROUS_NODE = {
+    "child_process": "Can execute system commands",
+    "fs": "Can access filesystem",
+    "net": "Can create network connections",
+    "dgram": "Can send UDP packets",
+    "crypto": "Cryptographic operations (check if needed)",
+}
+
+# Dangerous Python modules
+_DANGEROUS_PY = {
+    "subprocess": "Can execute system commands",
+    "os": "Can access operating system",
+    "requests": "Can make HTTP requests",
+    "socket": "Can create network connections",
+    "paramiko": "SSH client - can connect remotely",
+}
+
+# Common suspicious packages in requirements.txt (matched as substrings)
+SUSPICIOUS = (
+    "requests",
+    "httpx",
+    "aiohttp",  # Network access
+    "paramiko",
+    "fabric",  # SSH
+    "boto3",
+    "google-cloud",  # Cloud APIs
+)
+
+
+def _build_automaton(patterns: Iterable[str]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton matching any of the given substrings."""
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+
+SUSPICIOUS_AUTOMATON = _build_automaton(SUSPICIOUS)
+
+
+def _package_name(requirement: str) -> str:
+    """Extract the package name from a requirement string."""
+    match = _PKG_NAME_RE.match(requirement)
+    return match.group(1) if match else ""
+
 
 class SeverityLevel(str, Enum):
     CRITICAL = "CRITICAL"
@@ -23,6 +110,10 @@ class SeverityLevel(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Lookup table for Trivy severity strings, avoiding Enum.__call__ per vulnerability
+_SEV = {s.value: s for s in SeverityLevel}
+
+
 @dataclass
 class Vulnerability:
     """Represents a security vulnerability."""
@@ -49,6 +140,93 @@ class ScanResult:
     low_count: int
 
 
+def _scan_result_from_dict(data: Dict[str, Any]) -> ScanResult:
+    """Rebuild a ScanResult from its dataclasses.asdict() form."""
+    vulnerabilities = [
+        Vulnerability(**{**vuln, "severity": SeverityLevel(vuln["severity"])})
+        for vuln in data["vulnerabilities"]
+    ]
+    return ScanResult(**{**data, "vulnerabilities": vulnerabilities})
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write data as JSON to path via a temporary file and os.replace."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        console.print(f"[yellow]Could not write scan cache {path}: {e}[/yellow]")
+
+
+def _copy_atomic(src: Path, dst: Path) -> None:
+    """Copy src to dst via a temporary file and os.replace."""
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dst.with_name(dst.name + ".tmp")
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except OSError as e:
+        console.print(f"[yellow]Could not write scan cache {dst}: {e}[/yellow]")
+
+
+def _file_sha256(path: Path) -> bytes:
+    """Return the SHA-256 digest of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _touch_cache(path: Path) -> None:
+    """Mark a cache file as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: Path, max_files: int = SCAN_CACHE_MAX_FILES) -> None:
+    """Evict the least recently used cache files beyond max_files."""
+    try:
+        entries = [
+            (entry.stat().st_mtime_ns, entry.path)
+            for entry in os.scandir(cache_dir)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+    except OSError:
+        return
+
+    if len(entries) <= max_files:
+        return
+
+    entries.sort()
+    for _, path in entries[:-max_files]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class _TeeReader:
+    """Async stream reader that copies everything it reads into a file."""
+
+    def __init__(self, source: asyncio.StreamReader, sink: BinaryIO):
+        self.source = source
+        self.sink = sink
+
+    async def read(self, size: int = -1) -> bytes:
+        data = await self.source.read(size)
+        self.sink.write(data)
+        return data
+
+    def close(self) -> None:
+        self.sink.close()
+
+
 class StaticScanner:
     """Performs static analysis and dependency scanning."""
 
@@ -56,17 +234,113 @@ class StaticScanner:
         self.workspace_path = Path(workspace_path)
         self.results_dir = self.workspace_path / "reports"
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._digest: Optional[str] = None
+        self._digest_task: Optional[asyncio.Task] = None
 
-    def scan_with_trivy(self) -> Optional[ScanResult]:
+    async def scan_with_trivy(self, keep_report: bool = False) -> Optional[ScanResult]:
         """
         Run Trivy filesystem scan.
 
+        Results are cached on a content hash of every file in the workspace,
+        so only an unchanged tree skips the scan.
+        Trivy's JSON output is streamed from its stdout pipe straight into the
+        parser instead of going through a report file on disk.
+
+        Args:
+            keep_report: Also write the raw report to reports/trivy-report.json
+                (always runs Trivy)
+
         Returns:
             ScanResult with vulnerabilities found
         """
+        if keep_report:
+            return await self._run_trivy(keep_report=True)
+
+        digest = await self._workspace_digest()
+        cache_file = SCAN_CACHE_DIR / f"{digest}.json"
+
+        try:
+            with open(cache_file, "rb") as f:
+                cached = _scan_result_from_dict(orjson.loads(f.read()))
+            console.print("[green]Using cached Trivy results[/green]")
+            _touch_cache(cache_file)
+            cached.path = str(self.workspace_path)
+            return cached
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        scan_result = await self._run_trivy()
+
+        # Only successful scans are cached
+        if scan_result is not None:
+            _write_json_atomic(cache_file, asdict(scan_result))
+            _prune_cache(SCAN_CACHE_DIR)
+
+        return scan_result
+
+    async def _workspace_digest(self) -> str:
+        """
+        Return the tree digest, hashing the workspace at most once.
+
+        The scan and the SBOM run concurrently, so the hashing thread is
+        shared through a single task instead of being started by each caller.
+        """
+        if self._digest_task is None:
+            self._digest_task = asyncio.create_task(asyncio.to_thread(self._tree_digest))
+        return await self._digest_task
+
+    def _tree_digest(self) -> str:
+        """
+        Hash the relative path and content of every file in the workspace.
+
+        Trivy scans the whole tree (nested manifests, vendored packages,
+        secrets), so any file can change its findings. Symlinks are hashed by
+        their target rather than followed. The reports the scanner itself
+        writes (GENERATED_REPORTS) are skipped. The Trivy database metadata mtime
+        is mixed in so cached results are invalidated when the vulnerability
+        database is updated. The digest is computed once per scanner and shared
+        by the scan and SBOM caches.
+        """
+        if self._digest is not None:
+            return self._digest
+
+        digest = hashlib.sha256()
+        generated = {self.results_dir / name for name in GENERATED_REPORTS}
+
+        for root, dirs, files in os.walk(self.workspace_path):
+            root_path = Path(root)
+            dirs.sort()
+            for name in sorted(files):
+                path = root_path / name
+                if path in generated:
+                    continue
+                rel = path.relative_to(self.workspace_path).as_posix()
+                digest.update(rel.encode() + b"\0")
+                try:
+                    if path.is_symlink():
+                        digest.update(b"L" + os.readlink(path).encode())
+                    else:
+                        digest.update(b"F" + _file_sha256(path))
+                except OSError:
+                    digest.update(b"E")
+            # Symlinked directories show up in dirs but are not descended into
+            for name in dirs:
+                if (root_path / name).is_symlink():
+                    digest.update(f"{name}\0L{os.readlink(root_path / name)}".encode())
+
+        try:
+            digest.update(str(TRIVY_DB_METADATA.stat().st_mtime_ns).encode())
+        except OSError:
+            pass
+
+        self._digest = digest.hexdigest()
+        return self._digest
+
+    async def _run_trivy(self, keep_report: bool = False) -> Optional[ScanResult]:
+        """Run Trivy and parse its JSON output into a ScanResult."""
         console.print("[bold blue]Running Trivy scan...[/bold blue]")
 
-        output_file = self.results_dir / "trivy-report.json"
+        output_file = self.results_dir / TRIVY_REPORT_NAME
 
         try:
             # Run Trivy scan
@@ -75,67 +349,80 @@ class StaticScanner:
                 "fs",
                 "--format",
                 "json",
-                "--output",
-                str(output_file),
                 "--severity",
                 "CRITICAL,HIGH,MEDIUM,LOW",
                 str(self.workspace_path),
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-
-            if result.returncode != 0 and not output_file.exists():
-                console.print(f"[red]Trivy scan failed: {result.stderr}[/red]")
-                return None
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1 << 20,
+            )
+        except FileNotFoundError:
+            console.print("[yellow]Trivy not installed. Install with: brew install trivy[/yellow]")
+            return None
 
-            # Parse results
-            with open(output_file, "r") as f:
-                trivy_data = json.load(f)
+        # Drain stderr concurrently so a full pipe cannot block Trivy
+        stderr_task = asyncio.create_task(process.stderr.read())
 
-            return self._parse_trivy_results(trivy_data)
+        report = process.stdout
+        if keep_report:
+            report = _TeeReader(process.stdout, open(output_file, "wb"))
 
-        except subprocess.TimeoutExpired:
+        try:
+            scan_result = await asyncio.wait_for(
+                self._parse_trivy_results(ijson.items(report, TRIVY_VULNERABILITIES_PREFIX)),
+                timeout=TRIVY_TIMEOUT,
+            )
+        except ijson.JSONError:
+            # Nothing drains stdout any more, so stop Trivy before waiting on it
+            process.kill()
+            scan_result = None
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
             console.print("[red]Trivy scan timed out[/red]")
             return None
-        except FileNotFoundError:
-            console.print("[yellow]Trivy not installed. Install with: brew install trivy[/yellow]")
-            return None
         except Exception as e:
+            process.kill()
+            await process.wait()
             console.print(f"[red]Error running Trivy: {e}[/red]")
             return None
+        finally:
+            if keep_report:
+                report.close()
 
-    def _parse_trivy_results(self, trivy_data: Dict[str, Any]) -> ScanResult:
-        """Parse Trivy JSON output into ScanResult."""
-        vulnerabilities = []
+        returncode = await process.wait()
+        stderr = await stderr_task
 
-        results = trivy_data.get("Results", [])
-        for result in results:
-            vulns = result.get("Vulnerabilities", [])
-
-            for vuln in vulns:
-                vulnerabilities.append(
-                    Vulnerability(
-                        package_name=vuln.get("PkgName", "unknown"),
-                        installed_version=vuln.get("InstalledVersion", "unknown"),
-                        vulnerability_id=vuln.get("VulnerabilityID", "unknown"),
-                        severity=SeverityLevel(vuln.get("Severity", "UNKNOWN")),
-                        title=vuln.get("Title", ""),
-                        description=vuln.get("Description", ""),
-                        fixed_version=vuln.get("FixedVersion"),
-                    )
-                )
+        if returncode != 0 or scan_result is None:
+            console.print(f"[red]Trivy scan failed: {stderr.decode(errors='replace')}[/red]")
+            return None
 
-        # Count by severity
-        severity_counts = {
-            SeverityLevel.CRITICAL: 0,
-            SeverityLevel.HIGH: 0,
-            SeverityLevel.MEDIUM: 0,
-            SeverityLevel.LOW: 0,
-        }
+        return scan_result
 
-        for vuln in vulnerabilities:
-            if vuln.severity in severity_counts:
-                severity_counts[vuln.severity] += 1
+    async def _parse_trivy_results(self, vulns: AsyncIterable[Dict[str, Any]]) -> ScanResult:
+        """Parse a stream of Trivy vulnerability records into ScanResult."""
+        vulnerabilities = []
+        severity_counts: Counter = Counter()
+
+        # Single pass: build records and count severities together
+        async for vuln in vulns:
+            severity = _SEV.get(vuln.get("Severity"), SeverityLevel.UNKNOWN)
+            severity_counts[severity] += 1
+            vulnerabilities.append(
+                Vulnerability(
+                    package_name=vuln.get("PkgName", "unknown"),
+                    installed_version=vuln.get("InstalledVersion", "unknown"),
+                    vulnerability_id=vuln.get("VulnerabilityID", "unknown"),
+                    severity=severity,
+                    title=vuln.get("Title", ""),
+                    description=vuln.get("Description", ""),
+                    fixed_version=vuln.get("FixedVersion"),
+                )
+            )
 
         return ScanResult(
             path=str(self.workspace_path),
@@ -184,25 +471,16 @@ class StaticScanner:
         findings = {"suspicious_dependencies": [], "dangerous_permissions": []}
 
         try:
-            with open(package_json, "r") as f:
-                data = json.load(f)
-
-            # Dangerous Node.js modules
-            dangerous_modules = {
-                "child_process": "Can execute system commands",
-                "fs": "Can access filesystem",
-                "net": "Can create network connections",
-                "dgram": "Can send UDP packets",
-                "crypto": "Cryptographic operations (check if needed)",
-            }
+            with open(package_json, "rb") as f:
+                data = orjson.loads(f.read())
 
             all_deps = {}
             all_deps.update(data.get("dependencies", {}))
             all_deps.update(data.get("devDependencies", {}))
 
             for dep in all_deps:
-                if dep in dangerous_modules:
-                    findings["dangerous_permissions"].append(f"{dep}: {dangerous_modules[dep]}")
+                if dep in _DANGEROUS_NODE:
+                    findings["dangerous_permissions"].append(f"{dep}: {_DANGEROUS_NODE[dep]}")
 
         except Exception as e:
             console.print(f"[yellow]Error checking package.json: {e}[/yellow]")
@@ -213,28 +491,20 @@ class StaticScanner:
         """Check Python pyproject.toml for suspicious dependencies."""
         findings = {"suspicious_dependencies": [], "dangerous_permissions": []}
 
-        try:
-            import tomli
+        if not pyproject.exists():
+            return findings
 
+        try:
             with open(pyproject, "rb") as f:
-                data = tomli.load(f)
-
-            # Dangerous Python modules
-            dangerous_modules = {
-                "subprocess": "Can execute system commands",
-                "os": "Can access operating system",
-                "requests": "Can make HTTP requests",
-                "socket": "Can create network connections",
-                "paramiko": "SSH client - can connect remotely",
-            }
+                data = _toml.load(f)
 
             deps = data.get("project", {}).get("dependencies", [])
 
             for dep in deps:
-                dep_name = dep.split("[")[0].split(">=")[0].split("==")[0].strip()
-                if dep_name in dangerous_modules:
+                dep_name = _package_name(dep)
+                if dep_name in _DANGEROUS_PY:
                     findings["dangerous_permissions"].append(
-                        f"{dep_name}: {dangerous_modules[dep_name]}"
+                        f"{dep_name}: {_DANGEROUS_PY[dep_name]}"
                     )
 
         except Exception as e:
@@ -247,23 +517,18 @@ class StaticScanner:
         findings = {"suspicious_dependencies": [], "dangerous_permissions": []}
 
         try:
-            with open(requirements, "r") as f:
-                deps = [line.strip() for line in f if line.strip() and not line.startswith("#")]
-
-            # Common suspicious packages
-            suspicious = [
-                "requests",
-                "httpx",
-                "aiohttp",  # Network access
-                "paramiko",
-                "fabric",  # SSH
-                "boto3",
-                "google-cloud",  # Cloud APIs
+            # Split and strip as bytes (in C), decoding only the surviving lines
+            with open(requirements, "rb") as f:
+                lines = f.read().split(b"\n")
+            deps = [
+                stripped.decode()
+                for stripped in map(bytes.strip, lines)
+                if stripped and not stripped.startswith(b"#")
             ]
 
             for dep in deps:
-                dep_name = dep.split(">=")[0].split("==")[0].strip()
-                if any(susp in dep_name.lower() for susp in suspicious):
+                dep_name = _package_name(dep)
+                if any(True for _ in SUSPICIOUS_AUTOMATON.iter(dep_name.lower())):
                     findings["suspicious_dependencies"].append(dep_name)
 
         except Exception as e:
@@ -271,16 +536,28 @@ class StaticScanner:
 
         return findings
 
-    def generate_sbom(self) -> Optional[str]:
+    async def generate_sbom(self) -> Optional[str]:
         """
         Generate Software Bill of Materials (SBOM).
 
+        SBOMs are cached under the same workspace digest as Trivy results.
+
         Returns:
             Path to SBOM file
         """
         console.print("[bold blue]Generating SBOM...[/bold blue]")
 
-        sbom_file = self.results_dir / "sbom.json"
+        sbom_file = self.results_dir / SBOM_NAME
+        digest = await self._workspace_digest()
+        cache_file = SCAN_CACHE_DIR / f"{digest}.cdx.json"
+
+        try:
+            shutil.copyfile(cache_file, sbom_file)
+            console.print(f"[green]Using cached SBOM: {sbom_file}[/green]")
+            _touch_cache(cache_file)
+            return str(sbom_file)
+        except OSError:
+            pass
 
         try:
             cmd = [
@@ -293,10 +570,23 @@ class StaticScanner:
                 str(self.workspace_path),
             ]
 
-            subprocess.run(cmd, capture_output=True, timeout=120)
+            process = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+
+            try:
+                await asyncio.wait_for(process.communicate(), timeout=120)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
 
             if sbom_file.exists():
                 console.print(f"[green]SBOM generated: {sbom_file}[/green]")
+                # Only cache SBOMs Trivy actually wrote on this run
+                if process.returncode == 0:
+                    _copy_atomic(sbom_file, cache_file)
+                    _prune_cache(SCAN_CACHE_DIR)
                 return str(sbom_file)
 
         except Exception as e:
@@ -4,13 +4,84 @@ Handles cloning and installing MCP servers from GitHub repositories.
 """
 
 import asyncio
+import os
 import re
 import shutil
 import subprocess
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from src.installer.mcp_source import MCPSource, MCPConfig, SourceType
+from rich.console import Console
+
+from src.installer.mcp_source import MCPSource, MCPConfig, SourceType, read_stream_tail
+
+console = Console()
+
+# Default limit on concurrent git clones in fetch_and_install_many
+MAX_CONCURRENT_CLONES = 8
+
+# Seconds before a dependency install (npm/pip) is killed
+INSTALL_TIMEOUT = 600
+
+# Bare mirrors reused as clone references across runs (created by prewarm)
+MIRROR_DIR = Path.home() / ".cache" / "mcp-sandbox" / "mirrors"
+
+# Mirrors kept in MIRROR_DIR; least recently used mirrors beyond this are evicted
+MIRROR_MAX_REPOS = 64
+
+
+GITHUB_URL_PATTERN = re.compile(r"^https?://github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$")
+GITHUB_SHORT_PATTERN = re.compile(r"^([^/]+)/([^/]+)$")
+
+
+@lru_cache(maxsize=1024)
+def _parse_github_reference(reference: str) -> tuple[str, str]:
+    """
+    Parse a GitHub URL or owner/repo reference into (owner, repo).
+
+    Memoized because the same references recur across the validate, install
+    and scan phases.
+
+    Raises:
+        ValueError if reference is invalid
+    """
+    if reference.startswith(("http://", "https://")):
+        match = GITHUB_URL_PATTERN.match(reference)
+    else:
+        match = GITHUB_SHORT_PATTERN.match(reference)
+
+    if match:
+        return match.group(1), match.group(2)
+
+    raise ValueError(f"Invalid GitHub reference: {reference}")
+
+
+def _prune_mirrors(mirror_dir: Path, max_repos: int = MIRROR_MAX_REPOS) -> None:
+    """Evict the least recently used mirrors beyond max_repos."""
+    try:
+        entries = [
+            (mirror.stat().st_mtime_ns, mirror)
+            for owner in mirror_dir.iterdir()
+            if owner.is_dir()
+            for mirror in owner.iterdir()
+            if mirror.is_dir() and mirror.name.endswith(".git")
+        ]
+    except OSError:
+        return
+
+    if len(entries) <= max_repos:
+        return
+
+    entries.sort()
+    for _, mirror in entries[:-max_repos]:
+        shutil.rmtree(mirror, ignore_errors=True)
+        try:
+            # Drop the owner directory once its last mirror is gone
+            mirror.parent.rmdir()
+        except OSError:
+            pass
 
 
 class GitHubSource(MCPSource):
@@ -23,8 +94,8 @@ class GitHubSource(MCPSource):
     - Branches, tags, and commit references
     """
 
-    GITHUB_URL_PATTERN = re.compile(r"^https?://github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$")
-    GITHUB_SHORT_PATTERN = re.compile(r"^([^/]+)/([^/]+)$")
+    GITHUB_URL_PATTERN = GITHUB_URL_PATTERN
+    GITHUB_SHORT_PATTERN = GITHUB_SHORT_PATTERN
 
     def __init__(self, reference: str, ref: Optional[str] = None, version: Optional[str] = None, command: Optional[str] = None, args: Optional[list[str]] = None):
         """
@@ -67,17 +138,7 @@ class GitHubSource(MCPSource):
         Raises:
             ValueError if reference is invalid
         """
-        # Try full URL pattern
-        match = self.GITHUB_URL_PATTERN.match(reference)
-        if match:
-            return match.group(1), match.group(2)
-
-        # Try short pattern
-        match = self.GITHUB_SHORT_PATTERN.match(reference)
-        if match:
-            return match.group(1), match.group(2)
-
-        raise ValueError(f"Invalid GitHub reference: {reference}")
+        return _parse_github_reference(reference)
 
     async def fetch_and_install(self, target_dir: Path) -> Path:
         """
@@ -92,78 +153,224 @@ class GitHubSource(MCPSource):
         Raises:
             subprocess.CalledProcessError if git clone fails
         """
+        workspace = await self._clone(target_dir)
+
+        # Install dependencies if needed
+        await self._install_dependencies(workspace)
+
+        return workspace
+
+    @classmethod
+    async def fetch_and_install_many(
+        cls,
+        sources: list["GitHubSource"],
+        target_dir: Path,
+        max_concurrency: int = MAX_CONCURRENT_CLONES,
+    ) -> list[Path]:
+        """
+        Clone and install several GitHub repositories concurrently.
+
+        At most max_concurrency clones run at once. Dependency installation runs
+        outside the limit, so one repository installs while the next one clones.
+
+        Args:
+            sources: GitHub sources to fetch
+            target_dir: Directory to clone the repositories into
+            max_concurrency: Maximum number of concurrent git clones
+
+        Returns:
+            Paths to the cloned workspaces, in the same order as sources
+
+        Raises:
+            subprocess.CalledProcessError if any git clone fails
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(source: "GitHubSource") -> Path:
+            async with semaphore:
+                workspace = await source._clone(target_dir)
+            await source._install_dependencies(workspace)
+            return workspace
+
+        return list(await asyncio.gather(*(_fetch(source) for source in sources)))
+
+    async def _clone(self, target_dir: Path) -> Path:
+        """
+        Clone the repository into target_dir without installing dependencies.
+
+        Uses a shallow blobless clone, so only the blobs of the checked-out
+        tree are fetched. The full working tree is checked out because the
+        static scan covers every file, not just the top-level manifests.
+
+        Args:
+            target_dir: Directory to clone the repository into
+
+        Returns:
+            Path to the cloned workspace
+        """
         target_dir.mkdir(parents=True, exist_ok=True)
         workspace = target_dir / self.config.name
 
         # Build git clone command
-        clone_cmd = ["git", "clone", "--depth", "1"]
+        clone_cmd = ["git", "clone", "--filter=blob:none", "--depth", "1"]
 
         if self.config.ref:
             clone_cmd.extend(["--branch", self.config.ref])
 
+        # Reuse objects from an existing local mirror so only missing objects
+        # are fetched. Mirrors are only created by prewarm(), never implicitly.
+        mirror = self._existing_mirror()
+        if mirror:
+            clone_cmd.extend(["--reference", str(mirror), "--dissociate"])
+
         clone_cmd.extend([self.git_url, str(workspace)])
 
         # Run git clone
+        await self._run_git(clone_cmd)
+
+        # Update config with workspace path
+        self.config = replace(self.config, workspace_path=workspace)
+
+        return workspace
+
+    @property
+    def mirror_path(self) -> Path:
+        """Path of the local bare mirror of this repository."""
+        return MIRROR_DIR / self.owner / f"{self.repo}.git"
+
+    def _existing_mirror(self) -> Optional[Path]:
+        """
+        Return the local mirror of this repository if one has been prewarmed.
+
+        The mirror's mtime is bumped so eviction keeps recently used mirrors.
+        """
+        mirror = self.mirror_path
+        try:
+            os.utime(mirror)
+        except OSError:
+            return None
+        return mirror
+
+    async def _ensure_mirror(self) -> Optional[Path]:
+        """
+        Create or refresh the local mirror of this repository.
+
+        Returns:
+            Path to the mirror, or None if it could not be created or updated
+        """
+        mirror = self.mirror_path
+
+        try:
+            if mirror.exists():
+                await self._run_git(["git", "-C", str(mirror), "fetch", "--prune"])
+            else:
+                mirror.parent.mkdir(parents=True, exist_ok=True)
+                await self._run_git(
+                    ["git", "clone", "--mirror", "--filter=blob:none", self.git_url, str(mirror)]
+                )
+        except (OSError, subprocess.CalledProcessError):
+            # The mirror is only an optimization; clone directly instead
+            return None
+
+        try:
+            os.utime(mirror)
+        except OSError:
+            pass
+        return mirror
+
+    @classmethod
+    async def prewarm(cls, references: list[str]) -> None:
+        """
+        Create or refresh local mirrors for the given repositories.
+
+        Intended for CI jobs that fetch the same repositories repeatedly.
+        Clones only use mirrors created here. Once the mirrors are updated,
+        the least recently used ones beyond MIRROR_MAX_REPOS are evicted.
+
+        Args:
+            references: GitHub URLs or owner/repo references
+        """
+        sources = [cls(reference) for reference in references]
+        await asyncio.gather(*(source._ensure_mirror() for source in sources))
+        await asyncio.to_thread(_prune_mirrors, MIRROR_DIR)
+
+    async def _run_git(self, cmd: list[str]) -> None:
+        """
+        Run a git command.
+
+        Raises:
+            subprocess.CalledProcessError if the command fails
+        """
         process = await asyncio.create_subprocess_exec(
-            *clone_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
         )
 
         stdout, stderr = await process.communicate()
 
         if process.returncode != 0:
             raise subprocess.CalledProcessError(
-                process.returncode, clone_cmd, output=stdout, stderr=stderr
+                process.returncode, cmd, output=stdout, stderr=stderr
             )
 
-        # Update config with workspace path
-        self.config.workspace_path = workspace
-
-        # Install dependencies if needed
-        await self._install_dependencies(workspace)
-
-        return workspace
-
     async def _install_dependencies(self, workspace: Path) -> None:
         """
         Install dependencies for the MCP server.
 
+        Install output is discarded unless INSTALL_VERBOSE is set; stderr is
+        always captured so failures can be reported. Failed installs are
+        reported but do not abort the fetch.
+
         Args:
             workspace: Path to the workspace
         """
+        install_cmds = []
+
         # Check for package.json (Node.js)
         if (workspace / "package.json").exists():
-            npm_install = await asyncio.create_subprocess_exec(
-                "npm",
-                "install",
-                cwd=str(workspace),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await npm_install.communicate()
+            install_cmds.append(["npm", "install"])
 
         # Check for requirements.txt or pyproject.toml (Python)
         if (workspace / "requirements.txt").exists():
-            pip_install = await asyncio.create_subprocess_exec(
-                "pip",
-                "install",
-                "-r",
-                "requirements.txt",
-                cwd=str(workspace),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await pip_install.communicate()
+            install_cmds.append(["pip", "install", "-r", "requirements.txt"])
         elif (workspace / "pyproject.toml").exists():
-            pip_install = await asyncio.create_subprocess_exec(
-                "pip",
-                "install",
-                "-e",
-                ".",
-                cwd=str(workspace),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            install_cmds.append(["pip", "install", "-e", "."])
+
+        for cmd in install_cmds:
+            await self._run_install(cmd, workspace)
+
+    async def _run_install(self, cmd: list[str], workspace: Path) -> None:
+        """
+        Run a dependency install command in the workspace.
+
+        A failed or timed-out install is reported with the tail of its stderr
+        and otherwise ignored, so the server is still analysed with whatever
+        dependencies did install.
+        """
+        verbose = bool(os.environ.get("INSTALL_VERBOSE"))
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(workspace),
+            stdout=None if verbose else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        stderr_task = asyncio.create_task(read_stream_tail(process.stderr))
+        try:
+            await asyncio.wait_for(process.wait(), timeout=INSTALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            console.print(f"[yellow]{' '.join(cmd)} timed out after {INSTALL_TIMEOUT}s[/yellow]")
+            stderr_task.cancel()
+            return
+
+        stderr = await stderr_task
+        if process.returncode != 0:
+            console.print(
+                f"[yellow]{' '.join(cmd)} failed with exit code {process.returncode}: "
+                f"{stderr.decode(errors='replace')}[/yellow]"
             )
-            await pip_install.communicate()
 
     def cleanup(self) -> None:
         """Clean up cloned repository."""
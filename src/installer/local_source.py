@@ -3,6 +3,7 @@ Local filesystem source for MCP servers.
 Handles MCP servers that are already on the local filesystem.
 """
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -26,11 +27,12 @@ class LocalSource(MCPSource):
             command: Optional command to execute the MCP server
             args: Optional arguments for the command
         """
+        local_path = Path(path)
         config = MCPConfig(
-            name=Path(path).name,
+            name=local_path.name,
             source_type=SourceType.LOCAL,
             source_reference=path,
-            workspace_path=Path(path).resolve(),
+            workspace_path=local_path.resolve(),
             command=command,
             args=args,
         )
@@ -65,4 +67,9 @@ class LocalSource(MCPSource):
         Returns:
             True if path exists, False otherwise
         """
-        return self.config.workspace_path.exists()
+        # A single os.stat() call; avoids Path.exists() method dispatch
+        try:
+            os.stat(self.config.workspace_path)
+            return True
+        except (OSError, ValueError):
+            return False
@@ -3,6 +3,7 @@ Abstract base class for MCP sources.
 Defines interface for fetching and installing MCP servers from various sources.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
@@ -10,6 +11,31 @@ from pathlib import Path
 from typing import Optional
 
 
+# Bytes of installer stderr kept for error reporting
+STDERR_TAIL_BYTES = 64 * 1024
+
+
+async def read_stream_tail(stream: asyncio.StreamReader, limit: int = STDERR_TAIL_BYTES) -> bytes:
+    """
+    Drain a subprocess stream, keeping only its last bytes.
+
+    Installers can log megabytes; only the tail is useful for reporting a
+    failure, so older output is discarded as it is read.
+
+    Args:
+        stream: Stream to read until EOF
+        limit: Maximum number of trailing bytes to keep
+
+    Returns:
+        The last ``limit`` bytes of the stream
+    """
+    tail = bytearray()
+    while chunk := await stream.read(limit):
+        tail += chunk
+        del tail[:-limit]
+    return bytes(tail)
+
+
 class SourceType(str, Enum):
     """Type of MCP source."""
 
@@ -19,9 +45,13 @@ class SourceType(str, Enum):
     PYPI = "pypi"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MCPConfig:
-    """Configuration for an MCP server."""
+    """
+    Configuration for an MCP server.
+
+    Immutable; derive updated configs with dataclasses.replace().
+    """
 
     name: str
     source_type: SourceType
@@ -67,6 +97,15 @@ class MCPSource(ABC):
         """
         pass
 
+    async def cleanup_async(self) -> None:
+        """
+        Clean up without blocking the event loop.
+
+        Runs cleanup() in a worker thread, since removing an installed
+        dependency tree can take seconds.
+        """
+        await asyncio.to_thread(self.cleanup)
+
     @abstractmethod
     def validate(self) -> bool:
         """
@@ -5,10 +5,20 @@ Handles installing MCP servers from the npm registry.
 
 import asyncio
 import shutil
+import threading
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-from src.installer.mcp_source import MCPSource, MCPConfig, SourceType
+from src.installer.mcp_source import MCPSource, MCPConfig, SourceType, read_stream_tail
+
+# Shared workspace directory used by NpmSource.batch_fetch_and_install
+BATCH_WORKSPACE_NAME = "npm-batch"
+
+# Sources still using each shared batch workspace; the last one to clean up
+# removes it
+_BATCH_USERS: Dict[Path, int] = {}
+_BATCH_USERS_LOCK = threading.Lock()
 
 
 class NpmSource(MCPSource):
@@ -52,6 +62,9 @@ class NpmSource(MCPSource):
 
         self.package_name = pkg_name
         self.package_version = pkg_version
+        # Directory created for the install, removed by cleanup()
+        self._install_root: Optional[Path] = None
+        self._shared_install = False
 
     async def fetch_and_install(self, target_dir: Path) -> Path:
         """
@@ -70,46 +83,121 @@ class NpmSource(MCPSource):
         workspace = target_dir / self.config.name
         workspace.mkdir(parents=True, exist_ok=True)
 
+        self._install_root = workspace
+        await self._npm_install(workspace, [f"{self.package_name}@{self.package_version}"])
+
+        # The actual package is in node_modules
+        installed_package = workspace / "node_modules" / self.package_name
+
+        if not installed_package.exists():
+            raise FileNotFoundError(f"Package not found after install: {self.package_name}")
+
+        # Update config with workspace path (pointing to the installed package)
+        self.config = replace(self.config, workspace_path=installed_package)
+
+        return installed_package
+
+    @classmethod
+    async def batch_fetch_and_install(
+        cls, sources: list["NpmSource"], target_dir: Path
+    ) -> list[Path]:
+        """
+        Install several npm packages with a single npm install.
+
+        All packages share one workspace, so npm starts once and resolves a
+        single dependency graph instead of one per package. The workspace is
+        removed once every source has been cleaned up.
+
+        Args:
+            sources: npm sources to install
+            target_dir: Directory to create the shared workspace in
+
+        Returns:
+            Paths to the installed packages, in the same order as sources
+
+        Raises:
+            Exception if npm install fails
+        """
+        if not sources:
+            return []
+
+        workspace = target_dir / BATCH_WORKSPACE_NAME
+        workspace.mkdir(parents=True, exist_ok=True)
+
+        with _BATCH_USERS_LOCK:
+            _BATCH_USERS[workspace] = _BATCH_USERS.get(workspace, 0) + len(sources)
+        for source in sources:
+            source._install_root = workspace
+            source._shared_install = True
+
+        await cls._npm_install(
+            workspace, [f"{source.package_name}@{source.package_version}" for source in sources]
+        )
+
+        installed_packages = []
+        for source in sources:
+            installed_package = workspace / "node_modules" / source.package_name
+
+            if not installed_package.exists():
+                raise FileNotFoundError(f"Package not found after install: {source.package_name}")
+
+            source.config = replace(source.config, workspace_path=installed_package)
+            installed_packages.append(installed_package)
+
+        return installed_packages
+
+    @staticmethod
+    async def _npm_install(workspace: Path, package_specs: list[str]) -> None:
+        """
+        Run npm install for the given package specs in workspace.
+
+        Raises:
+            Exception if npm install fails
+        """
         # Create minimal package.json
         package_json = workspace / "package.json"
         package_json.write_text('{"name": "mcp-sandbox-temp", "version": "1.0.0"}\n')
 
         # Build npm install command
-        package_spec = f"{self.package_name}@{self.package_version}"
-        install_cmd = ["npm", "install", package_spec, "--no-save"]
+        install_cmd = ["npm", "install", *package_specs, "--no-save"]
 
         # Run npm install
         process = await asyncio.create_subprocess_exec(
             *install_cmd,
             cwd=str(workspace),
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
 
-        stdout, stderr = await process.communicate()
+        stderr = await read_stream_tail(process.stderr)
+        await process.wait()
 
         if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown error"
+            error_msg = stderr.decode(errors="replace") if stderr else "Unknown error"
             raise Exception(f"npm install failed: {error_msg}")
 
-        # The actual package is in node_modules
-        installed_package = workspace / "node_modules" / self.package_name
-
-        if not installed_package.exists():
-            raise FileNotFoundError(f"Package not found after install: {self.package_name}")
-
-        # Update config with workspace path (pointing to the installed package)
-        self.config.workspace_path = installed_package
-
-        return installed_package
-
     def cleanup(self) -> None:
-        """Clean up installed npm package."""
-        if self.config.workspace_path:
-            # Remove the parent workspace (includes node_modules)
-            workspace_root = self.config.workspace_path.parent.parent
-            if workspace_root.exists() and workspace_root.name == self.config.name:
-                shutil.rmtree(workspace_root)
+        """
+        Clean up installed npm package.
+
+        Removes the install workspace (including node_modules). A shared batch
+        workspace is only removed by the last of its sources to clean up.
+        """
+        workspace_root = self._install_root
+        if workspace_root is None:
+            return
+        self._install_root = None
+
+        if self._shared_install:
+            with _BATCH_USERS_LOCK:
+                remaining = _BATCH_USERS.get(workspace_root, 1) - 1
+                if remaining > 0:
+                    _BATCH_USERS[workspace_root] = remaining
+                    return
+                _BATCH_USERS.pop(workspace_root, None)
+
+        if workspace_root.exists():
+            shutil.rmtree(workspace_root)
 
     def validate(self) -> bool:
         """
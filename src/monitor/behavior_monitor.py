@@ -3,30 +3,95 @@ Behavioral monitoring using eBPF and system call tracking.
 Monitors filesystem access, network connections, and process execution.
 """
 
-import json
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import re
 import subprocess
+import threading
 import time
+from collections import Counter, deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Deque, Iterable, List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 
+import ahocorasick
+import orjson
 from rich.console import Console
 
+# The docker SDK is slow to import; the client is created on first use
+if TYPE_CHECKING:
+    import docker
+
 console = Console()
 
+# Seconds allowed for tshark to parse a capture
+TSHARK_TIMEOUT = 10
+
+# tshark arguments that print the query names of DNS packets, one packet per line
+TSHARK_DNS_ARGS = ("-Y", "dns.qry.name", "-T", "fields", "-e", "dns.qry.name")
+
+# Parsed DNS queries per capture, keyed on (path, size, mtime_ns); oldest
+# entries are evicted first
+DNS_CACHE_SIZE = 16
+_DNS_CACHE: Dict[tuple, List[str]] = {}
+
+# Seconds to wait for a docker exec in the monitored container
+DOCKER_EXEC_TIMEOUT = 5
+
+# Events kept in memory for the report; counts and alerts cover all events
+MAX_EVENTS = 10_000
+
+# Process names that indicate shell access or network tooling
+SUSPICIOUS_PROCESSES = (
+    "sh",
+    "bash",
+    "/bin/sh",
+    "/bin/bash",
+    "nc",
+    "netcat",
+    "curl",
+    "wget",
+)
+
+# connections.log states that indicate an outbound connection
+OUTBOUND_STATE_RE = re.compile(rb"ESTABLISHED|SYN_SENT")
+
+# Container log substrings that indicate errors
+ERROR_PATTERNS = ("error", "exception", "failed", "denied", "traceback", "fatal")
+
+
+def _build_automaton(patterns: Iterable[str]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton matching any of the given substrings."""
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
 
-class EventType(str, Enum):
+
+SUSPICIOUS_PROCESS_AUTOMATON = _build_automaton(SUSPICIOUS_PROCESSES)
+ERROR_PATTERN_AUTOMATON = _build_automaton(ERROR_PATTERNS)
+
+
+class EventType(IntEnum):
     """Types of monitoring events."""
 
-    FILESYSTEM = "filesystem"
-    NETWORK = "network"
-    PROCESS = "process"
-    SYSCALL = "syscall"
+    FILESYSTEM = 1
+    NETWORK = 2
+    PROCESS = 3
+    SYSCALL = 4
 
 
-@dataclass
+# Name of each event type in saved reports
+EVENT_TYPE_NAMES = {event_type: event_type.name.lower() for event_type in EventType}
+
+
+@dataclass(slots=True)
 class MonitoringEvent:
     """A single monitoring event."""
 
@@ -37,7 +102,7 @@ class MonitoringEvent:
     severity: str = "INFO"
 
 
-@dataclass
+@dataclass(slots=True)
 class BehaviorReport:
     """Complete behavioral monitoring report."""
 
@@ -48,12 +113,107 @@ class BehaviorReport:
     alerts: List[str]
 
 
+def _split_queries(line: str) -> List[str]:
+    """Split one tshark output line; multiple queries in a packet are comma-separated."""
+    return [q for q in line.strip().split(",") if q]
+
+
+class _TsharkDnsStream:
+    """
+    Long-lived tshark process fed with the bytes appended to a growing pcap.
+
+    Starting tshark is expensive, so while the capture is still being
+    written a single process parses it incrementally instead of a new
+    process re-reading the whole file on every monitoring pass.
+    """
+
+    def __init__(self, pcap_file: Path):
+        self.pcap_file = pcap_file
+        self.queries: List[str] = []
+        self._pos = 0
+        self._lines: queue.SimpleQueue = queue.SimpleQueue()
+        self._process = subprocess.Popen(
+            ["tshark", "-l", "-r", "-", *TSHARK_DNS_ARGS],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    def _read_output(self) -> None:
+        for line in self._process.stdout:
+            self._lines.put(line.decode(errors="replace"))
+
+    def poll(self) -> List[str]:
+        """
+        Feed newly captured bytes to tshark and collect parsed queries.
+
+        Packets tshark has not finished parsing yet are picked up by a later
+        poll.
+
+        Returns:
+            All DNS queries parsed so far
+
+        Raises:
+            OSError if tshark has exited or the capture cannot be read
+        """
+        with open(self.pcap_file, "rb") as f:
+            f.seek(self._pos)
+            new_bytes = f.read()
+        if new_bytes:
+            self._process.stdin.write(new_bytes)
+            self._process.stdin.flush()
+            self._pos += len(new_bytes)
+
+        while True:
+            try:
+                self.queries.extend(_split_queries(self._lines.get_nowait()))
+            except queue.Empty:
+                break
+
+        return list(self.queries)
+
+    def close(self) -> None:
+        """Stop tshark and its output reader thread."""
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=TSHARK_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        # stdout reaches EOF once tshark has exited, which ends the reader
+        self._reader.join()
+
+
 class BehaviorMonitor:
     """Monitors MCP server behavior using various techniques."""
 
-    def __init__(self, container_name: str = "mcp-malware-sandbox"):
+    def __init__(
+        self,
+        container_name: str = "mcp-malware-sandbox",
+        docker_client: Optional[docker.DockerClient] = None,
+    ):
+        """
+        Initialize behavior monitor.
+
+        Args:
+            container_name: Name of the sandbox container to monitor
+            docker_client: Docker client to reuse; created on first use if omitted
+        """
         self.container_name = container_name
-        self.events: List[MonitoringEvent] = []
+        self._docker = docker_client
+        # Read position in connections.log and time of the last log fetch,
+        # so repeated monitoring passes only process new output
+        self._conn_log_pos = 0
+        self._last_log_ts: Optional[int] = None
+        # Persistent tshark used while sampling a live capture
+        self._dns_stream: Optional[_TsharkDnsStream] = None
+        self._stream_dns = False
+        self._reset_events()
         self.start_time = datetime.now().isoformat()
         self.decoy_files = [
             "/tmp/fake_home/.ssh/id_rsa",
@@ -61,15 +221,96 @@ class BehaviorMonitor:
             "/tmp/fake_home/.aws/credentials",
         ]
 
+    @property
+    def docker(self) -> docker.DockerClient:
+        """Docker client used to query the container over the Engine API."""
+        if self._docker is None:
+            import docker
+
+            self._docker = docker.from_env()
+        return self._docker
+
     def start_monitoring(self) -> None:
         """Start all monitoring processes."""
         console.print("[bold blue]Starting behavioral monitoring...[/bold blue]")
         self.start_time = datetime.now().isoformat()
-        self.events = []
+        self._reset_events()
+        self._conn_log_pos = 0
+        self._last_log_ts = None
+        self._stream_dns = True
+
+    def _reset_events(self) -> None:
+        """Clear recorded events and their running aggregates."""
+        self.events: Deque[MonitoringEvent] = deque(maxlen=MAX_EVENTS)
+        # (event type, description) of events already recorded by sample()
+        self._seen: set[tuple[EventType, str]] = set()
+        self._type_counts: Counter = Counter()
+        self._severity_counts: Counter = Counter()
+        self._alerts: List[str] = []
+
+    def _record(self, event: MonitoringEvent) -> None:
+        """Record an event and update the running summary counts."""
+        self.events.append(event)
+        self._type_counts[event.event_type] += 1
+        self._severity_counts[event.severity] += 1
+        if event.severity in ("CRITICAL", "WARNING"):
+            self._alerts.append(event.description)
+
+    def close(self) -> None:
+        """Stop live sampling helpers such as the persistent tshark process."""
+        self._stream_dns = False
+        if self._dns_stream is not None:
+            self._dns_stream.close()
+            self._dns_stream = None
+
+    async def close_async(self) -> None:
+        """
+        Stop live sampling helpers without blocking the event loop.
+
+        Runs close() in a worker thread, since stopping tshark can wait up
+        to TSHARK_TIMEOUT seconds.
+        """
+        await asyncio.to_thread(self.close)
+
+    async def _docker_exec(
+        self, *args: str, timeout: float = DOCKER_EXEC_TIMEOUT
+    ) -> tuple[int, str]:
+        """
+        Run a command in the monitored container without blocking the loop.
 
-    def monitor_filesystem_access(self) -> List[MonitoringEvent]:
+        Args:
+            *args: Command and arguments to run inside the container
+            timeout: Seconds to wait before killing the exec
+
+        Returns:
+            Tuple of (return code, decoded stdout)
+
+        Raises:
+            asyncio.TimeoutError: If the command does not finish in time
+        """
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "exec",
+            self.container_name,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout.decode(errors="replace")
+
+    async def monitor_filesystem_access(self) -> List[MonitoringEvent]:
         """
-        Monitor filesystem access using strace.
+        Monitor filesystem access to the decoy files.
+
+        Decoy access is detected from file access times rather than by
+        tracing syscalls, so the monitored server runs without ptrace
+        overhead.
 
         Returns:
             List of filesystem events
@@ -79,47 +320,58 @@ class BehaviorMonitor:
         events = []
 
         try:
-            # Run strace to capture filesystem syscalls
-
-            # This would run in background
-            # For now, we'll check existing logs
-
             # Check if decoy files were accessed
-            for decoy in self.decoy_files:
-                event = self._check_decoy_access(decoy)
-                if event:
-                    events.append(event)
+            events.extend(await self._check_decoys_batch(self.decoy_files))
 
         except Exception as e:
             console.print(f"[yellow]Filesystem monitoring error: {e}[/yellow]")
 
         return events
 
-    def _check_decoy_access(self, filepath: str) -> Optional[MonitoringEvent]:
-        """Check if a decoy file was accessed."""
+    async def _check_decoys_batch(self, paths: List[str]) -> List[MonitoringEvent]:
+        """
+        Check whether any decoy files were accessed recently.
+
+        All paths are stat'ed in a single docker exec, so the cost of
+        entering the container is paid once rather than per decoy.
+
+        Args:
+            paths: Decoy file paths inside the container
+
+        Returns:
+            List of events for decoys accessed in the last 60 seconds
+        """
+        events = []
+        timestamp = datetime.now().isoformat()
+
         try:
-            # Check file access time in container
-            cmd = ["docker", "exec", self.container_name, "stat", "-c", "%X", filepath]
+            # Check file access times in container; stat exits nonzero if
+            # any path is missing but still reports the rest
+            _, output = await self._docker_exec("stat", "-c", "%n|%X", "--", *paths)
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            current_time = int(time.time())
 
-            if result.returncode == 0:
-                access_time = int(result.stdout.strip())
-                current_time = int(time.time())
+            for line in output.splitlines():
+                filepath, sep, atime = line.rpartition("|")
+                if not sep:
+                    continue
+                access_time = int(atime)
 
                 # If accessed in last 60 seconds
                 if current_time - access_time < 60:
-                    return MonitoringEvent(
-                        timestamp=datetime.now().isoformat(),
-                        event_type=EventType.FILESYSTEM,
-                        description=f"ALERT: Decoy file accessed: {filepath}",
-                        details={"path": filepath, "access_time": access_time},
-                        severity="CRITICAL",
+                    events.append(
+                        MonitoringEvent(
+                            timestamp=timestamp,
+                            event_type=EventType.FILESYSTEM,
+                            description=f"ALERT: Decoy file accessed: {filepath}",
+                            details={"path": filepath, "access_time": access_time},
+                            severity="CRITICAL",
+                        )
                     )
         except Exception:
             pass
 
-        return None
+        return events
 
     def monitor_network_activity(self) -> List[MonitoringEvent]:
         """
@@ -131,22 +383,28 @@ class BehaviorMonitor:
         console.print("[blue]Monitoring network activity...[/blue]")
 
         events = []
+        timestamp = datetime.now().isoformat()
 
         try:
             # Read network monitor logs
             connections_log = Path("docker/network-monitor/connections.log")
             if connections_log.exists():
-                with open(connections_log, "r") as f:
-                    content = f.read()
-
-                # Parse for outbound connections
-                if "ESTABLISHED" in content or "SYN_SENT" in content:
+                with open(connections_log, "rb") as f:
+                    # Start over if the log was truncated or rotated
+                    if os.fstat(f.fileno()).st_size < self._conn_log_pos:
+                        self._conn_log_pos = 0
+                    f.seek(self._conn_log_pos)
+                    new_content = f.read()
+                    self._conn_log_pos = f.tell()
+
+                # Parse new lines for outbound connections
+                if OUTBOUND_STATE_RE.search(new_content):
                     events.append(
                         MonitoringEvent(
-                            timestamp=datetime.now().isoformat(),
+                            timestamp=timestamp,
                             event_type=EventType.NETWORK,
                             description="Outbound network connection detected",
-                            details={"log": content[:500]},
+                            details={"log": new_content[:500].decode(errors="replace")},
                             severity="WARNING",
                         )
                     )
@@ -159,7 +417,7 @@ class BehaviorMonitor:
                 for query in dns_queries:
                     events.append(
                         MonitoringEvent(
-                            timestamp=datetime.now().isoformat(),
+                            timestamp=timestamp,
                             event_type=EventType.NETWORK,
                             description=f"DNS query: {query}",
                             details={"domain": query},
@@ -173,27 +431,55 @@ class BehaviorMonitor:
         return events
 
     def _parse_dns_from_pcap(self, pcap_file: Path) -> List[str]:
-        """Extract DNS queries from pcap file."""
+        """
+        Extract DNS queries from pcap file.
+
+        While monitoring is live, a persistent tshark process parses only
+        the newly captured bytes on each pass. Otherwise tshark parses the
+        whole capture, printing only the DNS query-name field, and its output
+        is consumed line by line. Full parses are cached on the capture's
+        size and mtime, so repeated passes over an unchanged capture skip
+        tshark.
+        """
+        if self._stream_dns:
+            try:
+                if self._dns_stream is None:
+                    self._dns_stream = _TsharkDnsStream(pcap_file)
+                return self._dns_stream.poll()
+            except OSError as e:
+                # Fall back to parsing the whole capture
+                console.print(f"[yellow]Live DNS parsing unavailable: {e}[/yellow]")
+                self.close()
+
         queries = []
 
         try:
+            st = pcap_file.stat()
+            cache_key = (str(pcap_file), st.st_size, st.st_mtime_ns)
+            cached = _DNS_CACHE.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
             # Use tshark to parse DNS
-            cmd = [
-                "tshark",
-                "-r",
-                str(pcap_file),
-                "-Y",
-                "dns.qry.name",
-                "-T",
-                "fields",
-                "-e",
-                "dns.qry.name",
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-
-            if result.returncode == 0:
-                queries = [q.strip() for q in result.stdout.split("\n") if q.strip()]
+            cmd = ["tshark", "-r", str(pcap_file), *TSHARK_DNS_ARGS]
+
+            with subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            ) as process:
+                timer = threading.Timer(TSHARK_TIMEOUT, process.kill)
+                timer.start()
+                try:
+                    for line in process.stdout:
+                        queries.extend(_split_queries(line))
+                finally:
+                    timer.cancel()
+
+            if process.returncode != 0:
+                queries = []
+            else:
+                _DNS_CACHE[cache_key] = list(queries)
+                while len(_DNS_CACHE) > DNS_CACHE_SIZE:
+                    del _DNS_CACHE[next(iter(_DNS_CACHE))]
 
         except FileNotFoundError:
             console.print("[yellow]tshark not available for DNS parsing[/yellow]")
@@ -212,39 +498,35 @@ class BehaviorMonitor:
         console.print("[blue]Monitoring process execution...[/blue]")
 
         events = []
+        timestamp = datetime.now().isoformat()
 
         try:
-            # Get process list from container
-            cmd = ["docker", "exec", self.container_name, "ps", "aux"]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                processes = result.stdout
-
-                # Check for suspicious processes
-                suspicious_procs = [
-                    "sh",
-                    "bash",
-                    "/bin/sh",
-                    "/bin/bash",
-                    "nc",
-                    "netcat",
-                    "curl",
-                    "wget",
-                ]
-
-                for proc in suspicious_procs:
-                    if proc in processes.lower():
-                        events.append(
-                            MonitoringEvent(
-                                timestamp=datetime.now().isoformat(),
-                                event_type=EventType.PROCESS,
-                                description=f"Suspicious process detected: {proc}",
-                                details={"process": proc},
-                                severity="WARNING",
-                            )
+            # Get process list from the Engine API; no process is spawned in
+            # the container
+            top = self.docker.api.top(self.container_name)
+            titles = top.get("Titles") or []
+            rows = top.get("Processes") or []
+
+            # Scan only the command column when the API reports one
+            cmd_index = titles.index("CMD") if "CMD" in titles else None
+            processes = "\n".join(
+                row[cmd_index] if cmd_index is not None else " ".join(row) for row in rows
+            ).lower()
+
+            # Check for suspicious processes in a single pass
+            found = {proc for _, proc in SUSPICIOUS_PROCESS_AUTOMATON.iter(processes)}
+
+            for proc in SUSPICIOUS_PROCESSES:
+                if proc in found:
+                    events.append(
+                        MonitoringEvent(
+                            timestamp=timestamp,
+                            event_type=EventType.PROCESS,
+                            description=f"Suspicious process detected: {proc}",
+                            details={"process": proc},
+                            severity="WARNING",
                         )
+                    )
 
         except Exception as e:
             console.print(f"[yellow]Process monitoring error: {e}[/yellow]")
@@ -261,76 +543,100 @@ class BehaviorMonitor:
         console.print("[blue]Collecting container logs...[/blue]")
 
         events = []
+        timestamp = datetime.now().isoformat()
 
         try:
-            cmd = ["docker", "logs", "--tail", "100", self.container_name]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-
-            if result.returncode == 0:
-                logs = result.stdout + result.stderr
-
-                # Check for error patterns
-                error_patterns = ["error", "exception", "failed", "denied", "traceback", "fatal"]
-
-                for pattern in error_patterns:
-                    if pattern in logs.lower():
-                        events.append(
-                            MonitoringEvent(
-                                timestamp=datetime.now().isoformat(),
-                                event_type=EventType.SYSCALL,
-                                description=f"Error pattern in logs: {pattern}",
-                                details={"pattern": pattern},
-                                severity="INFO",
-                            )
+            # Only fetch lines written since the previous pass
+            since = self._last_log_ts
+            self._last_log_ts = int(time.time())
+            output = self.docker.api.logs(
+                self.container_name, stdout=True, stderr=True, tail=100, since=since
+            )
+            logs = output.decode(errors="replace").lower()
+
+            # Check for error patterns in a single pass
+            found = {pattern for _, pattern in ERROR_PATTERN_AUTOMATON.iter(logs)}
+
+            # Report only the first pattern, in priority order
+            for pattern in ERROR_PATTERNS:
+                if pattern in found:
+                    events.append(
+                        MonitoringEvent(
+                            timestamp=timestamp,
+                            event_type=EventType.SYSCALL,
+                            description=f"Error pattern in logs: {pattern}",
+                            details={"pattern": pattern},
+                            severity="INFO",
                         )
-                        break
+                    )
+                    break
 
         except Exception as e:
             console.print(f"[yellow]Log collection error: {e}[/yellow]")
 
         return events
 
-    def generate_report(self) -> BehaviorReport:
+    async def sample(self) -> None:
+        """
+        Run every monitor once and record the new events.
+
+        The monitors are independent, so they run concurrently: the
+        filesystem check awaits its docker exec directly and the blocking
+        docker API/tshark monitors run in worker threads. Findings
+        already recorded by an earlier sample are not added again, so the
+        monitors can be sampled repeatedly while the server is exercised.
+        """
+        results = await asyncio.gather(
+            self.monitor_filesystem_access(),
+            asyncio.to_thread(self.monitor_network_activity),
+            asyncio.to_thread(self.monitor_process_execution),
+            asyncio.to_thread(self.collect_container_logs),
+        )
+
+        for events in results:
+            for event in events:
+                key = (event.event_type, event.description)
+                if key not in self._seen:
+                    self._seen.add(key)
+                    self._record(event)
+
+    async def generate_report(self) -> BehaviorReport:
         """
         Generate comprehensive behavioral monitoring report.
 
+        Takes a final sample, then reports every event recorded since
+        start_monitoring(). Only the most recent MAX_EVENTS events are
+        kept, but the summary and alerts cover all of them.
+
         Returns:
             BehaviorReport with all collected events
         """
         console.print("[bold blue]Generating behavioral report...[/bold blue]")
 
+        # Stop live parsing so the final sample parses complete captures
+        await self.close_async()
+
         # Collect all events
-        self.events.extend(self.monitor_filesystem_access())
-        self.events.extend(self.monitor_network_activity())
-        self.events.extend(self.monitor_process_execution())
-        self.events.extend(self.collect_container_logs())
+        await self.sample()
 
-        # Generate summary
+        # Counts and alerts are maintained as events are recorded
         summary = {
-            "total_events": len(self.events),
-            "filesystem_events": sum(
-                1 for e in self.events if e.event_type == EventType.FILESYSTEM
-            ),
-            "network_events": sum(1 for e in self.events if e.event_type == EventType.NETWORK),
-            "process_events": sum(1 for e in self.events if e.event_type == EventType.PROCESS),
-            "critical_events": sum(1 for e in self.events if e.severity == "CRITICAL"),
-            "warning_events": sum(1 for e in self.events if e.severity == "WARNING"),
+            "total_events": sum(self._type_counts.values()),
+            "filesystem_events": self._type_counts[EventType.FILESYSTEM],
+            "network_events": self._type_counts[EventType.NETWORK],
+            "process_events": self._type_counts[EventType.PROCESS],
+            "critical_events": self._severity_counts["CRITICAL"],
+            "warning_events": self._severity_counts["WARNING"],
         }
 
-        # Generate alerts
-        alerts = [
-            event.description for event in self.events if event.severity in ["CRITICAL", "WARNING"]
-        ]
-
         end_time = datetime.now().isoformat()
 
         report = BehaviorReport(
             start_time=self.start_time,
             end_time=end_time,
-            events=self.events,
+            events=list(self.events),
             summary=summary,
-            alerts=alerts,
+            alerts=list(self._alerts),
         )
 
         # Save report
@@ -346,27 +652,25 @@ class BehaviorMonitor:
 
             filename = reports_dir / f"behavior_report_{int(time.time())}.json"
 
-            with open(filename, "w") as f:
-                json.dump(
+            payload = {
+                "start_time": report.start_time,
+                "end_time": report.end_time,
+                "summary": report.summary,
+                "alerts": report.alerts,
+                "events": [
                     {
-                        "start_time": report.start_time,
-                        "end_time": report.end_time,
-                        "summary": report.summary,
-                        "alerts": report.alerts,
-                        "events": [
-                            {
-                                "timestamp": e.timestamp,
-                                "type": e.event_type.value,
-                                "description": e.description,
-                                "details": e.details,
-                                "severity": e.severity,
-                            }
-                            for e in report.events
-                        ],
-                    },
-                    f,
-                    indent=2,
-                )
+                        "timestamp": e.timestamp,
+                        "type": EVENT_TYPE_NAMES[e.event_type],
+                        "description": e.description,
+                        "details": e.details,
+                        "severity": e.severity,
+                    }
+                    for e in report.events
+                ],
+            }
+
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
             console.print(f"[green]Report saved: {filename}[/green]")
 
@@ -3,27 +3,50 @@ Main orchestrator for the MCP malware sandbox.
 Coordinates all phases: isolation, inspection, interrogation, and monitoring.
 """
 
+from __future__ import annotations
+
 import asyncio
-import json
 import tempfile
 import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-import docker
+import orjson
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 
 from src.inspector.static_scanner import StaticScanner, ScanResult
-from src.interrogator.llm_fuzzer import MCPInterrogator, FuzzResult
 from src.monitor.behavior_monitor import BehaviorMonitor, BehaviorReport
 from src.installer.source_factory import MCPSourceFactory
 
+# docker, the table renderer and the fuzzer (httpx) are imported where they
+# are first used so that importing the orchestrator stays cheap
+if TYPE_CHECKING:
+    from docker.models.containers import Container
+
+    from src.interrogator.llm_fuzzer import FuzzResult
+
 console = Console()
 
+# Seconds the sandbox container gets to exit before it is killed
+CONTAINER_STOP_TIMEOUT = 3
+
+# Seconds between behavior monitor samples while the server is being fuzzed
+MONITOR_INTERVAL = 5.0
+
+
+def _count_fuzz_findings(fuzz_results: list[FuzzResult]) -> tuple[int, int]:
+    """Count fuzz results with leaked data and with suspicious behavior in one pass."""
+    leaks = suspicious = 0
+    for result in fuzz_results:
+        if result.leaked_data:
+            leaks += 1
+        if result.suspicious_behavior:
+            suspicious += 1
+    return leaks, suspicious
+
 
 class SandboxStatus(str, Enum):
     """Status of sandbox execution."""
@@ -98,6 +121,8 @@ class MCPSandboxOrchestrator:
         self.temp_dir: Optional[tempfile.TemporaryDirectory] = None
 
         # Initialize Docker client
+        import docker
+
         self.docker_client = docker.from_env()
 
         # Results
@@ -132,6 +157,7 @@ class MCPSandboxOrchestrator:
 
             # Phase 2: Container Isolation
             console.print("\n[bold]Phase 2: Isolation Engine (Docker + gVisor)[/bold]")
+
             container = await self._setup_isolation()
 
             if not container:
@@ -141,19 +167,30 @@ class MCPSandboxOrchestrator:
 
             # Phase 3: Behavioral Monitoring (start)
             console.print("\n[bold]Phase 3: Behavioral Monitoring (Starting)[/bold]")
-            monitor = BehaviorMonitor(container.name)
+            monitor = BehaviorMonitor(container.name, self.docker_client)
             monitor.start_monitoring()
 
-            # Wait for container to be ready
-            await asyncio.sleep(5)
-
-            # Phase 4: Dynamic Interrogation
-            console.print("\n[bold]Phase 4: Dynamic Interrogation (LLM Fuzzing)[/bold]")
-            self.fuzz_results = await self._run_interrogation()
-
-            # Phase 5: Behavioral Monitoring (collect)
-            console.print("\n[bold]Phase 5: Behavioral Monitoring (Collecting)[/bold]")
-            self.behavior_report = monitor.generate_report()
+            # The monitor owns a tshark process and reader thread; stop them
+            # even if interrogation or reporting fails
+            try:
+                # Wait for container to be ready
+                await asyncio.sleep(5)
+
+                # Phase 4: Dynamic Interrogation, sampled by the monitor while it runs
+                console.print("\n[bold]Phase 4: Dynamic Interrogation (LLM Fuzzing)[/bold]")
+                stop_monitoring = asyncio.Event()
+                monitor_task = asyncio.create_task(self._monitor_loop(monitor, stop_monitoring))
+                try:
+                    self.fuzz_results = await self._run_interrogation()
+                finally:
+                    stop_monitoring.set()
+                    await monitor_task
+
+                # Phase 5: Behavioral Monitoring (collect)
+                console.print("\n[bold]Phase 5: Behavioral Monitoring (Collecting)[/bold]")
+                self.behavior_report = await monitor.generate_report()
+            finally:
+                await monitor.close_async()
 
             # Cleanup container
             await self._cleanup_container(container)
@@ -171,7 +208,7 @@ class MCPSandboxOrchestrator:
             return self._create_failed_result(str(e), time.time() - start_time)
         finally:
             # Cleanup source if needed
-            self._cleanup_source()
+            await self._cleanup_source()
 
     async def _fetch_mcp_source(self) -> None:
         """Fetch and install MCP source to workspace."""
@@ -194,16 +231,16 @@ class MCPSandboxOrchestrator:
         self.workspace_path = await self.mcp_source.fetch_and_install(target_dir)
         console.print(f"[green]✓ MCP source ready at: {self.workspace_path}[/green]")
 
-    def _cleanup_source(self) -> None:
+    async def _cleanup_source(self) -> None:
         """Cleanup temporary source files."""
         try:
             # For non-local sources, cleanup
             if self.mcp_source.config.source_type.value != "local":
-                self.mcp_source.cleanup()
+                await self.mcp_source.cleanup_async()
 
             # Cleanup temp directory
             if self.temp_dir:
-                self.temp_dir.cleanup()
+                await asyncio.to_thread(self.temp_dir.cleanup)
         except Exception as e:
             console.print(f"[yellow]Cleanup warning: {e}[/yellow]")
 
@@ -213,20 +250,18 @@ class MCPSandboxOrchestrator:
         # Initialize scanner with workspace path
         scanner = StaticScanner(str(self.workspace_path))
 
-        # Run Trivy scan
-        scan_result = scanner.scan_with_trivy()
-
-        # Check permissions
-        permissions = scanner.check_permissions_manifest()
+        # Run Trivy scan, permission checks and SBOM generation concurrently
+        scan_result, permissions, _ = await asyncio.gather(
+            scanner.scan_with_trivy(),
+            asyncio.to_thread(scanner.check_permissions_manifest),
+            scanner.generate_sbom(),
+        )
 
         if permissions.get("dangerous_permissions"):
             console.print("[yellow]⚠ Dangerous permissions detected:[/yellow]")
             for perm in permissions["dangerous_permissions"]:
                 console.print(f"  - {perm}")
 
-        # Generate SBOM
-        scanner.generate_sbom()
-
         if scan_result:
             console.print("\n[bold]Vulnerability Summary:[/bold]")
             console.print(f"  Critical: {scan_result.critical_count}")
@@ -236,15 +271,16 @@ class MCPSandboxOrchestrator:
 
         return scan_result
 
-    async def _setup_isolation(self) -> Optional[docker.models.containers.Container]:
+    async def _setup_isolation(self) -> Optional[Container]:
         """Setup Phase 2: Isolation Engine."""
+        import docker.errors
 
         console.print("[blue]Building sandbox container...[/blue]")
 
         try:
             # Check if image exists, build if not
             try:
-                self.docker_client.images.get("mcp-sandbox:latest")
+                await asyncio.to_thread(self.docker_client.images.get, "mcp-sandbox:latest")
             except docker.errors.ImageNotFound:
                 console.print("[yellow]Building Docker image...[/yellow]")
                 # In real implementation, build from Dockerfile
@@ -262,7 +298,8 @@ class MCPSandboxOrchestrator:
             }
 
             # Run container with security restrictions
-            container = self.docker_client.containers.run(
+            container = await asyncio.to_thread(
+                self.docker_client.containers.run,
                 "mcp-sandbox:latest",
                 name=f"mcp-sandbox-{int(time.time())}",
                 detach=True,
@@ -291,6 +328,7 @@ class MCPSandboxOrchestrator:
 
     async def _run_interrogation(self) -> list[FuzzResult]:
         """Run Phase 3: Dynamic Interrogation."""
+        from src.interrogator.llm_fuzzer import MCPInterrogator
 
         interrogator = MCPInterrogator(self.mcp_server_url, self.anthropic_api_key)
 
@@ -299,8 +337,7 @@ class MCPSandboxOrchestrator:
 
             # Summary
             total = len(results)
-            with_leaks = sum(1 for r in results if r.leaked_data)
-            with_suspicious = sum(1 for r in results if r.suspicious_behavior)
+            with_leaks, with_suspicious = _count_fuzz_findings(results)
 
             console.print("\n[bold]Fuzzing Summary:[/bold]")
             console.print(f"  Total payloads: {total}")
@@ -312,12 +349,30 @@ class MCPSandboxOrchestrator:
         finally:
             await interrogator.close()
 
-    async def _cleanup_container(self, container: docker.models.containers.Container) -> None:
+    async def _monitor_loop(
+        self,
+        monitor: BehaviorMonitor,
+        stop_event: asyncio.Event,
+        interval: float = MONITOR_INTERVAL,
+    ) -> None:
+        """Sample the behavior monitors every interval seconds until stop_event is set."""
+        while not stop_event.is_set():
+            try:
+                await monitor.sample()
+            except Exception as e:
+                console.print(f"[yellow]Monitoring sample failed: {e}[/yellow]")
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _cleanup_container(self, container: Container) -> None:
         """Cleanup container after analysis."""
         try:
             console.print("[blue]Cleaning up container...[/blue]")
-            container.stop(timeout=10)
-            container.remove()
+            await asyncio.to_thread(container.stop, timeout=CONTAINER_STOP_TIMEOUT)
+            await asyncio.to_thread(container.remove, force=True)
             console.print("[green]✓ Container cleaned up[/green]")
         except Exception as e:
             console.print(f"[yellow]Cleanup error: {e}[/yellow]")
@@ -338,8 +393,7 @@ class MCPSandboxOrchestrator:
 
         # Fuzzing score (max 30 points)
         if self.fuzz_results:
-            leaks = sum(1 for r in self.fuzz_results if r.leaked_data)
-            suspicious = sum(1 for r in self.fuzz_results if r.suspicious_behavior)
+            leaks, suspicious = _count_fuzz_findings(self.fuzz_results)
             score += min(leaks * 10, 20)
             score += min(suspicious * 5, 10)
 
@@ -369,7 +423,7 @@ class MCPSandboxOrchestrator:
             )
 
         if self.fuzz_results:
-            leaks = sum(1 for r in self.fuzz_results if r.leaked_data)
+            leaks, _ = _count_fuzz_findings(self.fuzz_results)
             if leaks > 0:
                 recommendations.append(f"🔐 Fix {leaks} data leak vulnerabilities")
 
@@ -408,6 +462,7 @@ class MCPSandboxOrchestrator:
 
     def _display_summary(self, result: SandboxResult) -> None:
         """Display summary table."""
+        from rich.table import Table
 
         # Create summary table
         table = Table(title="Security Analysis Summary", show_header=True)
@@ -442,6 +497,8 @@ class MCPSandboxOrchestrator:
         output_path = Path("reports") / output_file
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        leaks, suspicious = _count_fuzz_findings(result.fuzz_results)
+
         # Convert to dict (simplified)
         result_dict = {
             "status": result.status.value,
@@ -459,13 +516,13 @@ class MCPSandboxOrchestrator:
             ),
             "fuzzing_summary": {
                 "total_tests": len(result.fuzz_results),
-                "leaked_data": sum(1 for r in result.fuzz_results if r.leaked_data),
-                "suspicious": sum(1 for r in result.fuzz_results if r.suspicious_behavior),
+                "leaked_data": leaks,
+                "suspicious": suspicious,
             },
             "behavior_summary": result.behavior_report.summary if result.behavior_report else None,
         }
 
-        with open(output_path, "w") as f:
-            json.dump(result_dict, f, indent=2)
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(result_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
         console.print(f"\n[green]Results saved to: {output_path}[/green]")
@@ -5,10 +5,40 @@ This module provides functionality to parse MCP test configuration files
 from the MCP-list directory.
 """
 
+import logging
+import os
 import re
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
+# Options a configuration file may set
+CONFIG_KEYS = ("source", "ref", "version", "source_type", "server_url", "anthropic_key")
+
+# Matches "key: value" lines for the known options (case-insensitively), so
+# one scan over the file yields only candidate options. Matching runs on the
+# raw bytes and only the captured groups are decoded. The leading group holds
+# whatever precedes the key; it must be whitespace, which rules out comments
+_OPTION_RE = re.compile(
+    rb"^([^\w\n]*?)(%s):[^\S\n]*(.*?)[^\S\n]*$" % b"|".join(key.encode() for key in CONFIG_KEYS),
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# Options every configuration file must set to a non-empty value
+REQUIRED_KEYS = frozenset({"source"})
+
+# Changed files under this prefix belong to the MCP named by the next component
+MCP_LIST_PREFIX = "MCP-list/"
+
+# Upper bound on threads used to read config files concurrently
+MAX_PARSE_WORKERS = 32
+
+# Parsed configs kept per (path, mtime_ns, size), so unchanged files are
+# only parsed once per process
+PARSE_CACHE_SIZE = 4096
+
 
 def parse_config_file(config_path: str) -> Dict[str, Optional[str]]:
     """
@@ -27,74 +57,148 @@ def parse_config_file(config_path: str) -> Dict[str, Optional[str]]:
         source_type: github
         server_url: http://localhost:8000
     """
-    config = {
-        "source": None,
-        "ref": None,
-        "version": None,
-        "source_type": None,
-        "server_url": None,
-        "anthropic_key": None,
-    }
-
-    with open(config_path, "r") as f:
-        for line in f:
-            # Strip whitespace and skip comments/empty lines
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            # Parse key: value format
-            match = re.match(r"^(\w+):\s*(.+)$", line)
-            if match:
-                key, value = match.groups()
-                key = key.lower()
-                value = value.strip()
-                
-                # Remove inline comments (anything after # that's not part of a URL)
-                # Keep # if it's part of a URL or version spec
-                if '#' in value and not any(x in value for x in ['http://', 'https://', 'git@']):
-                    value = value.split('#')[0].strip()
-
-                if key in config:
-                    config[key] = value
+    config = dict.fromkeys(CONFIG_KEYS)
+
+    # Config files are small, so one read beats line-by-line iteration
+    with open(config_path, "rb") as f:
+        # Treat a bare CR as a line break too; CRLF just adds a blank line
+        data = f.read().replace(b"\r", b"\n")
+
+    seen_required = set()
+    for match in _OPTION_RE.finditer(data):
+        lead, raw_key, raw_value = match.groups()
+        # ASCII whitespace is the common case; anything else may still be
+        # Unicode whitespace such as NBSP
+        if lead.strip() and not lead.decode("utf-8").isspace():
+            continue
+        key = raw_key.decode("ascii").lower()
+        # The bytes pattern only trims ASCII whitespace; strip() also drops
+        # Unicode whitespace such as NBSP
+        value = raw_value.decode("utf-8").strip()
+        if value:
+            # Remove inline comments (anything after # that's not part of a URL)
+            # Keep # if it's part of a URL or version spec
+            if '#' in value and not any(x in value for x in ['http://', 'https://', 'git@']):
+                value = value.split('#')[0].strip()
+
+            config[key] = value
+            if key in REQUIRED_KEYS:
+                # A later line may clear an option set earlier
+                if value:
+                    seen_required.add(key)
+                else:
+                    seen_required.discard(key)
 
     # Validate required fields
-    if not config["source"]:
-        raise ValueError("Configuration file must specify 'source'")
+    missing = REQUIRED_KEYS - seen_required
+    if missing:
+        names = ", ".join(f"'{key}'" for key in sorted(missing))
+        raise ValueError(f"Configuration file must specify {names}")
 
     return config
 
 
-def find_mcp_configs(base_path: str = "MCP-list") -> Dict[str, Dict[str, Optional[str]]]:
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_file_version(config_path: str, mtime_ns: int, size: int) -> Dict[str, Optional[str]]:
     """
-    Find all MCP configurations in the MCP-list directory.
+    Parse one version of a configuration file.
+
+    The modification time and size only form part of the cache key, so an
+    edited file misses the cache. lru_cache keeps the cache bounded and is
+    safe to call from the _load_configs worker threads; use
+    _parse_file_version.cache_info() for hit/miss counts.
 
     Args:
-        base_path: Base directory containing MCP configurations
+        config_path: Path to the configuration file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+
+    Returns:
+        Dictionary containing parsed configuration options
+    """
+    return parse_config_file(config_path)
+
+
+def _parse_cached(config_path: str) -> Dict[str, Optional[str]]:
+    """
+    Parse a configuration file, reusing the result while the file is unchanged.
+
+    Args:
+        config_path: Path to the configuration file
+
+    Returns:
+        Dictionary containing parsed configuration options
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist
+        ValueError: If the configuration is invalid
+    """
+    st = os.stat(config_path)
+    return dict(_parse_file_version(config_path, st.st_mtime_ns, st.st_size))
+
+
+def _load_configs(config_files: Dict[str, str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Parse MCP configuration files concurrently through the parse cache.
+
+    Missing files are skipped and invalid ones are logged as warnings.
+
+    Args:
+        config_files: Mapping of MCP names to their config.txt paths
 
     Returns:
         Dictionary mapping MCP names to their configurations
     """
-    base_dir = Path(base_path)
-    if not base_dir.exists():
+    if not config_files:
         return {}
 
+    # Each file is independent I/O, so read them concurrently; opening
+    # config.txt directly replaces a separate exists() check
     configs = {}
-    for mcp_dir in base_dir.iterdir():
-        if not mcp_dir.is_dir():
-            continue
-
-        config_file = mcp_dir / "config.txt"
-        if config_file.exists():
+    with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(config_files))) as pool:
+        futures = {
+            name: pool.submit(_parse_cached, config_file)
+            for name, config_file in config_files.items()
+        }
+        for name, future in futures.items():
             try:
-                config = parse_config_file(str(config_file))
-                configs[mcp_dir.name] = config
+                configs[name] = future.result()
+            except FileNotFoundError:
+                continue
             except Exception as e:
-                print(f"Warning: Failed to parse config for {mcp_dir.name} at {config_file}: {e}")
+                logger.warning(
+                    "Failed to parse config for %s at %s: %s", name, config_files[name], e
+                )
 
     return configs
 
 
+def find_mcp_configs(base_path: str = "MCP-list") -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Find all MCP configurations in the MCP-list directory.
+
+    Args:
+        base_path: Base directory containing MCP configurations
+
+    Returns:
+        Dictionary mapping MCP names to their configurations
+    """
+    try:
+        entries = os.scandir(base_path)
+    except FileNotFoundError:
+        return {}
+
+    # DirEntry.is_dir() uses the type from the directory listing
+    with entries:
+        config_files = {
+            entry.name: os.path.join(entry.path, "config.txt")
+            for entry in entries
+            if entry.is_dir()
+        }
+
+    return _load_configs(config_files)
+
+
 def get_changed_mcp_configs(changed_files: list) -> Dict[str, Dict[str, Optional[str]]]:
     """
     Get MCP configurations for changed files in a PR.
@@ -105,27 +209,20 @@ def get_changed_mcp_configs(changed_files: list) -> Dict[str, Dict[str, Optional
     Returns:
         Dictionary mapping MCP names to their configurations
     """
+    # Files inside an MCP-list/<name>/ directory; the name ends at the next slash
+    prefix_len = len(MCP_LIST_PREFIX)
     mcp_names = set()
-
     for file_path in changed_files:
-        # Check if file is in MCP-list directory
-        if file_path.startswith("MCP-list/"):
-            parts = file_path.split("/")
-            if len(parts) >= 2:
-                mcp_name = parts[1]
-                mcp_names.add(mcp_name)
-
-    configs = {}
-    for mcp_name in mcp_names:
-        config_file = Path("MCP-list") / mcp_name / "config.txt"
-        if config_file.exists():
-            try:
-                config = parse_config_file(str(config_file))
-                configs[mcp_name] = config
-            except Exception as e:
-                print(f"Warning: Failed to parse config for {mcp_name} at {config_file}: {e}")
+        if not file_path.startswith(MCP_LIST_PREFIX):
+            continue
+        end = file_path.find("/", prefix_len)
+        if end != -1:
+            mcp_names.add(file_path[prefix_len:end])
 
-    return configs
+    config_files = {
+        mcp_name: os.path.join("MCP-list", mcp_name, "config.txt") for mcp_name in mcp_names
+    }
+    return _load_configs(config_files)
 
 
 if __name__ == "__main__":
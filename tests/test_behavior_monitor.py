@@ -0,0 +1,341 @@
+"""
+Test the behavior monitor module.
+"""
+
+import asyncio
+import io
+import json
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.monitor import behavior_monitor
+from src.monitor.behavior_monitor import BehaviorMonitor, EventType, MonitoringEvent
+
+
+async def no_events():
+    return []
+
+
+@pytest.mark.asyncio
+async def test_check_decoys_batch_single_exec(monkeypatch):
+    """Test decoy files are checked with one docker exec."""
+    now = int(time.time())
+    calls = []
+
+    async def fake_exec(*args, **kwargs):
+        calls.append(args)
+        return 1, f"/tmp/fake_home/.env|{now}\n/tmp/fake_home/.ssh/id_rsa|{now - 3600}\n"
+
+    monitor = BehaviorMonitor("test-container")
+    monkeypatch.setattr(monitor, "_docker_exec", fake_exec)
+    events = await monitor._check_decoys_batch(monitor.decoy_files)
+
+    assert len(calls) == 1
+    assert list(calls[0][-len(monitor.decoy_files) :]) == monitor.decoy_files
+    assert len(events) == 1
+    assert events[0].event_type == EventType.FILESYSTEM
+    assert events[0].details == {"path": "/tmp/fake_home/.env", "access_time": now}
+
+
+@pytest.mark.asyncio
+async def test_docker_exec_kills_command_on_timeout(monkeypatch):
+    """Test a docker exec that overruns its timeout is killed."""
+    processes = []
+
+    class FakeProcess:
+        returncode = None
+
+        async def communicate(self):
+            await asyncio.sleep(10)
+
+        def kill(self):
+            self.returncode = -9
+
+        async def wait(self):
+            return self.returncode
+
+    async def fake_create(*args, **kwargs):
+        processes.append(FakeProcess())
+        return processes[-1]
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_create)
+
+    monitor = BehaviorMonitor("test-container")
+    with pytest.raises(asyncio.TimeoutError):
+        await monitor._docker_exec("stat", "/tmp", timeout=0.01)
+
+    assert processes[0].returncode == -9
+
+
+@pytest.mark.asyncio
+async def test_generate_report_collects_all_monitors(monkeypatch, tmp_path):
+    """Test generate_report gathers events from every monitor in order."""
+    monkeypatch.chdir(tmp_path)
+    monitor = BehaviorMonitor("test-container")
+
+    def make_event(event_type, severity):
+        return MonitoringEvent(
+            timestamp="now", event_type=event_type, description=event_type.name, severity=severity
+        )
+
+    async def fake_filesystem_monitor():
+        return [make_event(EventType.FILESYSTEM, "CRITICAL")]
+
+    monkeypatch.setattr(monitor, "monitor_filesystem_access", fake_filesystem_monitor)
+    monkeypatch.setattr(
+        monitor, "monitor_network_activity", lambda: [make_event(EventType.NETWORK, "INFO")]
+    )
+    monkeypatch.setattr(
+        monitor, "monitor_process_execution", lambda: [make_event(EventType.PROCESS, "WARNING")]
+    )
+    monkeypatch.setattr(monitor, "collect_container_logs", lambda: [])
+
+    report = await monitor.generate_report()
+
+    assert [e.event_type for e in report.events] == [
+        EventType.FILESYSTEM,
+        EventType.NETWORK,
+        EventType.PROCESS,
+    ]
+    assert report.summary["total_events"] == 3
+    assert report.summary["critical_events"] == 1
+    assert report.summary["warning_events"] == 1
+    assert report.alerts == ["FILESYSTEM", "PROCESS"]
+    (saved,) = (tmp_path / "reports").glob("behavior_report_*.json")
+    assert [e["type"] for e in json.loads(saved.read_text())["events"]] == [
+        "filesystem",
+        "network",
+        "process",
+    ]
+
+
+class FakeDockerAPI:
+    """Minimal stand-in for docker.APIClient."""
+
+    def __init__(self, top=None, logs=b""):
+        self._top = top or {"Titles": [], "Processes": []}
+        self._logs = logs
+
+    def top(self, container):
+        return self._top
+
+    def logs(self, container, **kwargs):
+        return self._logs
+
+
+class FakeDockerClient:
+    """Minimal stand-in for docker.DockerClient."""
+
+    def __init__(self, **kwargs):
+        self.api = FakeDockerAPI(**kwargs)
+
+
+def test_monitor_process_execution_reports_each_match():
+    """Test every suspicious process name in the command column is reported."""
+    top = {
+        "Titles": ["UID", "PID", "PPID", "C", "STIME", "TTY", "TIME", "CMD"],
+        "Processes": [
+            ["shadow", "1", "0", "0", "10:00", "?", "00:00:00", "node server.js"],
+            ["root", "42", "1", "0", "10:01", "?", "00:00:00", "/bin/sh -c curl http://x"],
+        ],
+    }
+    monitor = BehaviorMonitor("test-container", FakeDockerClient(top=top))
+
+    events = monitor.monitor_process_execution()
+
+    assert [e.details["process"] for e in events] == ["sh", "/bin/sh", "curl"]
+
+
+def test_collect_container_logs_reports_first_pattern():
+    """Test only the highest-priority error pattern is reported."""
+    monitor = BehaviorMonitor("test-container", FakeDockerClient(logs=b"Traceback\nERROR: boom\n"))
+
+    events = monitor.collect_container_logs()
+
+    assert [e.details["pattern"] for e in events] == ["error"]
+
+
+def test_monitor_network_activity_reads_only_new_log_lines(monkeypatch, tmp_path):
+    """Test connections.log is consumed incrementally across passes."""
+    monkeypatch.chdir(tmp_path)
+    log = tmp_path / "docker" / "network-monitor" / "connections.log"
+    log.parent.mkdir(parents=True)
+    log.write_bytes(b"tcp 10.0.0.2:4000 1.2.3.4:443 ESTABLISHED\n")
+
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+
+    first = monitor.monitor_network_activity()
+    second = monitor.monitor_network_activity()
+    with open(log, "ab") as f:
+        f.write(b"tcp 10.0.0.2:4001 5.6.7.8:80 SYN_SENT\n")
+    third = monitor.monitor_network_activity()
+
+    assert len(first) == 1
+    assert second == []
+    assert third[0].details["log"] == "tcp 10.0.0.2:4001 5.6.7.8:80 SYN_SENT\n"
+
+
+@pytest.mark.asyncio
+async def test_sample_skips_repeated_findings(monkeypatch):
+    """Test repeated samples do not record the same finding twice."""
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+    passes = iter([["curl"], ["curl", "wget"]])
+
+    def fake_process_monitor():
+        return [
+            MonitoringEvent(
+                timestamp="now",
+                event_type=EventType.PROCESS,
+                description=f"Suspicious process detected: {proc}",
+                severity="WARNING",
+            )
+            for proc in next(passes)
+        ]
+
+    monkeypatch.setattr(monitor, "monitor_filesystem_access", no_events)
+    monkeypatch.setattr(monitor, "monitor_network_activity", lambda: [])
+    monkeypatch.setattr(monitor, "monitor_process_execution", fake_process_monitor)
+    monkeypatch.setattr(monitor, "collect_container_logs", lambda: [])
+
+    await monitor.sample()
+    await monitor.sample()
+
+    assert [e.description for e in monitor.events] == [
+        "Suspicious process detected: curl",
+        "Suspicious process detected: wget",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_generate_report_counts_events_beyond_cap(monkeypatch, tmp_path):
+    """Test the summary counts every event even when old ones are evicted."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("src.monitor.behavior_monitor.MAX_EVENTS", 2)
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+    monitor.start_monitoring()
+
+    def fake_process_monitor():
+        return [
+            MonitoringEvent(
+                timestamp="now",
+                event_type=EventType.PROCESS,
+                description=f"Suspicious process detected: {proc}",
+                severity="WARNING",
+            )
+            for proc in ("curl", "wget", "nc")
+        ]
+
+    monkeypatch.setattr(monitor, "monitor_filesystem_access", no_events)
+    monkeypatch.setattr(monitor, "monitor_network_activity", lambda: [])
+    monkeypatch.setattr(monitor, "monitor_process_execution", fake_process_monitor)
+    monkeypatch.setattr(monitor, "collect_container_logs", lambda: [])
+
+    report = await monitor.generate_report()
+
+    assert len(report.events) == 2
+    assert report.summary["total_events"] == 3
+    assert report.summary["process_events"] == 3
+    assert len(report.alerts) == 3
+
+
+def test_parse_dns_from_pcap_caches_unchanged_capture(monkeypatch, tmp_path):
+    """Test tshark runs once for an unchanged capture file."""
+    runs = []
+
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            runs.append(cmd)
+            self.stdout = io.StringIO("example.com\nevil.io,other.net\n")
+            self.returncode = 0
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def kill(self):
+            pass
+
+    monkeypatch.setattr(subprocess, "Popen", FakePopen)
+    monkeypatch.setattr(behavior_monitor, "_DNS_CACHE", {})
+
+    pcap = tmp_path / "capture.pcap"
+    pcap.write_bytes(b"pcap")
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+
+    first = monitor._parse_dns_from_pcap(pcap)
+    second = monitor._parse_dns_from_pcap(pcap)
+
+    assert first == second == ["example.com", "evil.io", "other.net"]
+    assert len(runs) == 1
+
+
+def test_parse_dns_from_pcap_streams_live_capture(monkeypatch, tmp_path):
+    """Test a live capture is parsed incrementally by one tshark process."""
+    # Fake tshark that echoes each line of the "capture" it reads from stdin
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_tshark = bin_dir / "tshark"
+    fake_tshark.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "for line in sys.stdin:\n"
+        "    print(line.strip(), flush=True)\n"
+    )
+    fake_tshark.chmod(fake_tshark.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def poll_until(count):
+        deadline = time.monotonic() + 5
+        while True:
+            queries = monitor._parse_dns_from_pcap(pcap)
+            if len(queries) >= count or time.monotonic() > deadline:
+                return queries
+            time.sleep(0.01)
+
+    pcap = tmp_path / "capture.pcap"
+    pcap.write_bytes(b"example.com\n")
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+    monitor.start_monitoring()
+
+    try:
+        assert poll_until(1) == ["example.com"]
+        stream = monitor._dns_stream
+
+        with open(pcap, "ab") as f:
+            f.write(b"evil.io,other.net\n")
+        assert poll_until(3) == ["example.com", "evil.io", "other.net"]
+        assert monitor._dns_stream is stream
+    finally:
+        monitor.close()
+
+    assert monitor._dns_stream is None
+    assert stream._process.poll() is not None
+    assert not stream._reader.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_close_async_stops_stream_off_the_event_loop():
+    """Test close_async stops the tshark stream in a worker thread."""
+    closed_in = []
+
+    class FakeStream:
+        def close(self):
+            closed_in.append(threading.current_thread())
+
+    monitor = BehaviorMonitor("test-container", FakeDockerClient())
+    monitor.start_monitoring()
+    monitor._dns_stream = FakeStream()
+
+    await monitor.close_async()
+
+    assert closed_in and closed_in[0] is not threading.main_thread()
+    assert monitor._dns_stream is None
+    assert monitor._stream_dns is False
@@ -8,6 +8,7 @@ from pathlib import Path
 
 import pytest
 
+from src.utils import config_parser
 from src.utils.config_parser import (
     parse_config_file,
     find_mcp_configs,
@@ -18,6 +19,13 @@ from src.utils.config_parser import (
 class TestConfigParser:
     """Test configuration parser functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_parse_cache(self):
+        """Start each test with an empty config parse cache."""
+        config_parser._parse_file_version.cache_clear()
+        yield
+        config_parser._parse_file_version.cache_clear()
+
     def test_parse_basic_config(self, tmp_path):
         """Test parsing a basic configuration file."""
         config_file = tmp_path / "config.txt"
@@ -261,3 +269,85 @@ server_url: http://example.com/path#fragment
 
         assert config["source"] == "https://github.com/owner/repo#branch"
         assert config["server_url"] == "http://example.com/path#fragment"
+
+    def test_parse_config_ignores_malformed_lines(self, tmp_path):
+        """Test that lines without a key, separator or value are skipped."""
+        config_file = tmp_path / "config.txt"
+        config_file.write_text(
+            """
+source: owner/repo
+ref:
+version 1.0.0
+server url: http://localhost:8000
+"""
+        )
+
+        config = parse_config_file(str(config_file))
+
+        assert config["source"] == "owner/repo"
+        assert config["ref"] is None
+        assert config["version"] is None
+        assert config["server_url"] is None
+
+    def test_find_mcp_configs_reuses_unchanged_configs(self, tmp_path, monkeypatch):
+        """Test that unchanged config files are only parsed once."""
+        mcp_dir = tmp_path / "MCP-list" / "mcp1"
+        mcp_dir.mkdir(parents=True)
+        config_file = mcp_dir / "config.txt"
+        config_file.write_text("source: owner/repo1")
+        monkeypatch.chdir(tmp_path)
+
+        calls = []
+        real_parse = config_parser.parse_config_file
+
+        def counting_parse(config_path):
+            calls.append(config_path)
+            return real_parse(config_path)
+
+        monkeypatch.setattr(config_parser, "parse_config_file", counting_parse)
+
+        find_mcp_configs()
+        get_changed_mcp_configs(["MCP-list/mcp1/config.txt"])
+        assert len(calls) == 1
+
+        config_file.write_text("source: owner/repo2\nref: main")
+        configs = find_mcp_configs()
+
+        assert len(calls) == 2
+        assert configs["mcp1"]["source"] == "owner/repo2"
+
+    def test_find_mcp_configs_skips_invalid_configs(self, tmp_path, monkeypatch, caplog):
+        """Test that one invalid config does not stop the others loading."""
+        mcp_list = tmp_path / "MCP-list"
+        for name in ("good1", "bad", "good2"):
+            (mcp_list / name).mkdir(parents=True)
+        (mcp_list / "good1" / "config.txt").write_text("source: owner/repo1")
+        (mcp_list / "bad" / "config.txt").write_text("ref: main")
+        (mcp_list / "good2" / "config.txt").write_text("source: owner/repo2")
+        monkeypatch.chdir(tmp_path)
+
+        configs = find_mcp_configs()
+
+        assert sorted(configs) == ["good1", "good2"]
+        assert "Failed to parse config for bad" in caplog.text
+
+    def test_parse_config_comment_only_source(self, tmp_path):
+        """Test that a source left empty by an inline comment is rejected."""
+        config_file = tmp_path / "config.txt"
+        config_file.write_text("source: owner/repo\nsource: # cleared\n")
+
+        with pytest.raises(ValueError, match="must specify 'source'"):
+            parse_config_file(str(config_file))
+
+    def test_parse_config_unicode_whitespace_and_bare_cr(self, tmp_path):
+        """Test NBSP is trimmed like other whitespace and a bare CR ends a line."""
+        config_file = tmp_path / "config.txt"
+        config_file.write_bytes(
+            "\u00a0source:\u00a0owner/repo\u00a0\rref: main\r\nversion: 1.0.0".encode("utf-8")
+        )
+
+        config = parse_config_file(str(config_file))
+
+        assert config["source"] == "owner/repo"
+        assert config["ref"] == "main"
+        assert config["version"] == "1.0.0"
@@ -2,16 +2,40 @@
 Test the MCP source installer modules.
 """
 
-import pytest
+import asyncio
+import os
+import sys
+from dataclasses import replace
 from pathlib import Path
+
+import pytest
 from src.installer.local_source import LocalSource
+from src.installer import github_source
 from src.installer.github_source import GitHubSource
 from src.installer.npm_source import NpmSource
 from src.installer.pypi_source import PyPiSource
-from src.installer.source_factory import MCPSourceFactory
+from src.installer.source_factory import MCPSourceFactory, _detect_source_kind
 from src.installer.mcp_source import SourceType
 
 
+class ConcurrencyProbe:
+    """Async context manager recording the peak number of concurrent holders."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def __aenter__(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        # Yield so other tasks get a chance to enter while this one is inside
+        await asyncio.sleep(0.01)
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        return False
+
+
 class TestLocalSource:
     """Test LocalSource."""
 
@@ -81,6 +105,89 @@ class TestGitHubSource:
         source = GitHubSource("owner/repo")
         assert source.git_url == "https://github.com/owner/repo.git"
 
+    @pytest.mark.asyncio
+    async def test_clone_checks_out_full_tree(self, tmp_path, monkeypatch):
+        """Test the clone is a single shallow checkout of the whole tree."""
+        calls = []
+
+        async def fake_run_git(self, cmd):
+            calls.append(cmd)
+
+        monkeypatch.setattr(GitHubSource, "_run_git", fake_run_git)
+        monkeypatch.setattr(github_source, "MIRROR_DIR", tmp_path / "mirrors")
+
+        source = GitHubSource("owner/repo")
+        workspace = await source._clone(tmp_path)
+
+        assert workspace == tmp_path / "repo"
+        assert calls == [
+            [
+                "git",
+                "clone",
+                "--filter=blob:none",
+                "--depth",
+                "1",
+                source.git_url,
+                str(tmp_path / "repo"),
+            ]
+        ]
+        # No mirror is created implicitly
+        assert not (tmp_path / "mirrors").exists()
+
+    @pytest.mark.asyncio
+    async def test_clone_references_existing_mirror(self, tmp_path, monkeypatch):
+        """Test a prewarmed mirror is used as a reference without being fetched."""
+        calls = []
+
+        async def fake_run_git(self, cmd):
+            calls.append(cmd)
+
+        monkeypatch.setattr(GitHubSource, "_run_git", fake_run_git)
+        monkeypatch.setattr(github_source, "MIRROR_DIR", tmp_path / "mirrors")
+
+        source = GitHubSource("owner/repo")
+        source.mirror_path.mkdir(parents=True)
+        await source._clone(tmp_path)
+
+        assert calls == [
+            [
+                "git",
+                "clone",
+                "--filter=blob:none",
+                "--depth",
+                "1",
+                "--reference",
+                str(source.mirror_path),
+                "--dissociate",
+                source.git_url,
+                str(tmp_path / "repo"),
+            ]
+        ]
+
+    def test_prune_mirrors_evicts_least_recently_used(self, tmp_path):
+        """Test only the most recently used mirrors are kept."""
+        for age, name in enumerate(["new", "mid", "old"]):
+            mirror = tmp_path / name / "repo.git"
+            mirror.mkdir(parents=True)
+            os.utime(mirror, (1000 - age, 1000 - age))
+
+        github_source._prune_mirrors(tmp_path, max_repos=2)
+
+        assert (tmp_path / "new" / "repo.git").exists()
+        assert (tmp_path / "mid" / "repo.git").exists()
+        assert not (tmp_path / "old").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_install_is_reported_not_raised(self, tmp_path, capsys):
+        """Test a failing install command logs its stderr and does not abort."""
+        cmd = [sys.executable, "-c", "import sys; sys.stderr.write('boom'); sys.exit(3)"]
+
+        await GitHubSource("owner/repo")._run_install(cmd, tmp_path)
+
+        output = capsys.readouterr().out
+        assert "exit code 3" in output
+        assert "boom" in output
+
 
 class TestNpmSource:
     """Test NpmSource."""
@@ -141,10 +248,44 @@ class TestPyPiSource:
         source = PyPiSource("")
         assert source.validate() is False
 
+    def test_config_is_immutable(self):
+        """Test MCPConfig rejects in-place updates."""
+        import dataclasses
+
+        source = PyPiSource("my-package")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            source.config.workspace_path = Path("/tmp")
+
+    @pytest.mark.asyncio
+    async def test_cleanup_async(self, tmp_path):
+        """Test cleanup_async removes the installed workspace."""
+        source = PyPiSource("my-package")
+        pip_target = tmp_path / "my-package" / "package"
+        pip_target.mkdir(parents=True)
+        source.config = replace(source.config, workspace_path=pip_target)
+
+        await source.cleanup_async()
+
+        assert not (tmp_path / "my-package").exists()
+
 
 class TestMCPSourceFactory:
     """Test MCPSourceFactory."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_detection_cache(self):
+        """Start each test with an empty source detection cache."""
+        _detect_source_kind.cache_clear()
+        yield
+        _detect_source_kind.cache_clear()
+
+    def test_detection_is_memoized(self):
+        """Test repeated references reuse the cached detection."""
+        first = MCPSourceFactory.create_source("npm:my-package")
+        second = MCPSourceFactory.create_source("npm:my-package")
+        assert first is not second
+        assert _detect_source_kind.cache_info().hits == 1
+
     def test_local_path_absolute(self, tmp_path):
         """Test local absolute path detection."""
         source = MCPSourceFactory.create_source(str(tmp_path))
@@ -215,3 +356,172 @@ class TestMCPSourceFactory:
         assert isinstance(source, NpmSource)
         assert source.config.command == "npx"
         assert source.config.args == ["-y", "@openbnb/mcp-server-airbnb", "--ignore-robots-txt"]
+
+
+class TestMCPSourceFactoryBatch:
+    """Test MCPSourceFactory.create_sources."""
+
+    @pytest.mark.asyncio
+    async def test_create_sources_preserves_order(self, tmp_path):
+        """Test batch creation resolves each entry in order."""
+        sources = await MCPSourceFactory.create_sources(
+            [
+                {"reference": "npm:my-package"},
+                {"reference": str(tmp_path)},
+                {"reference": "owner/repo", "source_type": "github", "ref": "main"},
+            ]
+        )
+
+        assert isinstance(sources[0], NpmSource)
+        assert isinstance(sources[1], LocalSource)
+        assert isinstance(sources[2], GitHubSource)
+        assert sources[2].config.ref == "main"
+
+
+class TestGitHubSourceBatch:
+    """Test GitHubSource.fetch_and_install_many."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_install_many_limits_concurrency(self, tmp_path, monkeypatch):
+        """Test batch fetch bounds concurrent clones and preserves order."""
+        probe = ConcurrencyProbe()
+
+        async def fake_clone(self, target_dir):
+            async with probe:
+                return target_dir / self.config.name
+
+        async def fake_install(self, workspace):
+            return None
+
+        monkeypatch.setattr(GitHubSource, "_clone", fake_clone)
+        monkeypatch.setattr(GitHubSource, "_install_dependencies", fake_install)
+
+        sources = [GitHubSource(f"owner/repo{i}") for i in range(5)]
+        workspaces = await GitHubSource.fetch_and_install_many(
+            sources, tmp_path, max_concurrency=2
+        )
+
+        assert workspaces == [tmp_path / f"repo{i}" for i in range(5)]
+        assert probe.peak == 2
+
+
+class TestNpmSourceBatch:
+    """Test NpmSource.batch_fetch_and_install."""
+
+    @pytest.mark.asyncio
+    async def test_batch_fetch_and_install_single_npm_call(self, tmp_path, monkeypatch):
+        """Test batch install runs npm once with every package spec."""
+        calls = []
+
+        async def fake_npm_install(workspace, package_specs):
+            calls.append(package_specs)
+            for spec in package_specs:
+                name = spec.rsplit("@", 1)[0]
+                (workspace / "node_modules" / name).mkdir(parents=True)
+
+        monkeypatch.setattr(NpmSource, "_npm_install", staticmethod(fake_npm_install))
+
+        sources = [NpmSource("pkg-a@1.0.0"), NpmSource("@scope/pkg-b")]
+        installed = await NpmSource.batch_fetch_and_install(sources, tmp_path)
+
+        assert calls == [["pkg-a@1.0.0", "@scope/pkg-b@latest"]]
+        assert installed == [
+            tmp_path / "npm-batch" / "node_modules" / "pkg-a",
+            tmp_path / "npm-batch" / "node_modules" / "@scope/pkg-b",
+        ]
+        assert sources[1].config.workspace_path == installed[1]
+
+    @pytest.mark.asyncio
+    async def test_batch_workspace_removed_by_last_cleanup(self, tmp_path, monkeypatch):
+        """Test the shared batch workspace outlives all but the last cleanup."""
+
+        async def fake_npm_install(workspace, package_specs):
+            for spec in package_specs:
+                (workspace / "node_modules" / spec.rsplit("@", 1)[0]).mkdir(parents=True)
+
+        monkeypatch.setattr(NpmSource, "_npm_install", staticmethod(fake_npm_install))
+
+        sources = [NpmSource("pkg-a@1.0.0"), NpmSource("@scope/pkg-b")]
+        await NpmSource.batch_fetch_and_install(sources, tmp_path)
+        workspace = tmp_path / "npm-batch"
+
+        sources[0].cleanup()
+        sources[0].cleanup()
+        assert workspace.exists()
+
+        sources[1].cleanup()
+        assert not workspace.exists()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_scoped_package_workspace(self, tmp_path, monkeypatch):
+        """Test cleanup removes the install workspace of a scoped package."""
+
+        async def fake_npm_install(workspace, package_specs):
+            (workspace / "node_modules" / "@scope" / "pkg").mkdir(parents=True)
+
+        monkeypatch.setattr(NpmSource, "_npm_install", staticmethod(fake_npm_install))
+
+        source = NpmSource("@scope/pkg")
+        await source.fetch_and_install(tmp_path)
+        source.cleanup()
+
+        assert not (tmp_path / "@scope" / "pkg").exists()
+
+
+class TestPyPiSourceBatch:
+    """Test PyPiSource.batch_fetch_and_install."""
+
+    @pytest.mark.asyncio
+    async def test_batch_fetch_and_install_runs_concurrently(self, tmp_path, monkeypatch):
+        """Test batch install overlaps installs and preserves order."""
+        probe = ConcurrencyProbe()
+
+        async def fake_fetch_and_install(self, target_dir):
+            async with probe:
+                return target_dir / self.package_name
+
+        monkeypatch.setattr(PyPiSource, "fetch_and_install", fake_fetch_and_install)
+
+        sources = [PyPiSource(f"pkg-{i}") for i in range(3)]
+        installed = await PyPiSource.batch_fetch_and_install(sources, tmp_path)
+
+        assert installed == [tmp_path / f"pkg-{i}" for i in range(3)]
+        assert probe.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_read_stream_tail_keeps_last_bytes():
+    """Test read_stream_tail drains a stream and keeps only its tail."""
+    from src.installer.mcp_source import read_stream_tail
+
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"a" * 100 + b"tail")
+    stream.feed_eof()
+
+    assert await read_stream_tail(stream, limit=8) == b"aaaatail"
+
+
+@pytest.mark.asyncio
+async def test_npm_install_error_survives_truncated_utf8(tmp_path, monkeypatch):
+    """Test a stderr tail cut mid-character still surfaces the npm error."""
+    from src.installer import npm_source
+
+    class FakeProcess:
+        stderr = None
+        returncode = 1
+
+        async def wait(self):
+            return self.returncode
+
+    async def fake_exec(*args, **kwargs):
+        return FakeProcess()
+
+    async def fake_tail(stream):
+        # Last byte of a UTF-8 "©" followed by the real error
+        return b"\xa9 npm ERR! 404 Not Found"
+
+    monkeypatch.setattr(npm_source.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(npm_source, "read_stream_tail", fake_tail)
+
+    with pytest.raises(Exception, match="npm ERR! 404 Not Found"):
+        await NpmSource._npm_install(tmp_path, ["missing-pkg@1.0.0"])
@@ -2,8 +2,15 @@
 Test the LLM fuzzer module.
 """
 
+import httpx
 import pytest
-from src.interrogator.llm_fuzzer import MCPInterrogator, AttackType
+from src.interrogator.llm_fuzzer import (
+    MCPInterrogator,
+    AttackType,
+    FuzzPayload,
+    FuzzResult,
+    _iter_strings,
+)
 
 
 @pytest.mark.asyncio
@@ -29,3 +36,139 @@ def test_generate_manual_payloads():
     assert any(p.attack_type == AttackType.COMMAND_INJECTION for p in payloads)
     assert any(p.attack_type == AttackType.PATH_TRAVERSAL for p in payloads)
     assert any(p.attack_type == AttackType.SQL_INJECTION for p in payloads)
+
+
+def _mock_interrogator(response_body):
+    """Create an interrogator whose server always returns response_body."""
+    interrogator = MCPInterrogator("http://localhost:8000")
+    interrogator.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=response_body))
+    )
+    return interrogator
+
+
+@pytest.mark.asyncio
+async def test_execute_payload_detects_leaks():
+    """Test leak detection categories in execute_payload."""
+    interrogator = _mock_interrogator({"content": [{"text": "root:x:0:0 uid=0(root) PASSWORD=1"}]})
+    payload = FuzzPayload(
+        tool_name="read_file",
+        attack_type=AttackType.PATH_TRAVERSAL,
+        payload={"path": "../../etc/passwd"},
+        description="Path traversal via path",
+        is_malicious=True,
+    )
+
+    result = await interrogator.execute_payload(payload)
+    await interrogator.close()
+
+    assert result.success
+    assert result.leaked_data == [
+        "Potential credential leak detected",
+        "File system information leaked",
+    ]
+    assert result.suspicious_behavior == ["Possible command execution"]
+
+
+@pytest.mark.asyncio
+async def test_execute_payload_clean_response():
+    """Test execute_payload reports nothing for a benign response."""
+    interrogator = _mock_interrogator({"content": [{"text": "hello world"}]})
+    payload = FuzzPayload(
+        tool_name="echo",
+        attack_type=AttackType.COMMAND_INJECTION,
+        payload={"text": "hello world"},
+        description="Valid baseline payload",
+        is_malicious=False,
+    )
+
+    result = await interrogator.execute_payload(payload)
+    await interrogator.close()
+
+    assert result.success
+    assert result.leaked_data == []
+    assert result.suspicious_behavior == []
+
+
+@pytest.mark.asyncio
+async def test_execute_payload_scans_non_strict_json():
+    """Test responses orjson rejects (NaN, huge ints) are still leak-scanned."""
+    body = b'{"score": NaN, "id": 123456789012345678901234567890, "text": "root:x:0:0"}'
+    interrogator = MCPInterrogator("http://localhost:8000")
+    interrogator.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    )
+    payload = FuzzPayload(
+        tool_name="read_file",
+        attack_type=AttackType.PATH_TRAVERSAL,
+        payload={"path": "../../etc/passwd"},
+        description="Path traversal via path",
+        is_malicious=True,
+    )
+
+    result = await interrogator.execute_payload(payload)
+    await interrogator.close()
+
+    assert result.success
+    assert result.response["id"] == 123456789012345678901234567890
+    assert result.leaked_data == ["File system information leaked"]
+
+
+def test_iter_strings_walks_keys_and_leaves():
+    """Test _iter_strings yields nested string keys and values only."""
+    data = {"content": [{"text": "a", "n": 1}, "b"], "ok": True}
+    assert list(_iter_strings(data)) == ["content", "text", "a", "n", "b", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_run_fuzzing_campaign_bounds_concurrency(monkeypatch):
+    """Test payloads run concurrently up to the limit and keep their order."""
+    import asyncio
+
+    interrogator = MCPInterrogator("http://localhost:8000")
+    active = 0
+    peak = 0
+
+    async def fake_execute_payload(payload):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return FuzzResult(
+            payload=payload,
+            success=True,
+            response={},
+            error=None,
+            leaked_data=[],
+            suspicious_behavior=[],
+        )
+
+    monkeypatch.setattr(interrogator, "execute_payload", fake_execute_payload)
+
+    tools = [
+        {"name": f"tool_{i}", "inputSchema": {"properties": {"arg": {"type": "string"}}}}
+        for i in range(3)
+    ]
+    expected = [
+        payload for tool in tools for payload in interrogator._generate_manual_payloads(tool)
+    ]
+
+    results = await interrogator.run_fuzzing_campaign(tools, max_concurrency=4)
+    await interrogator.close()
+
+    assert [r.payload for r in results] == expected
+    assert peak == 4
+
+
+def test_manual_payloads_cached_per_schema_shape():
+    """Test manual payloads are reused for identical tool schemas."""
+    interrogator = MCPInterrogator("http://localhost:8000")
+    tool_schema = {"name": "cached_tool", "inputSchema": {"properties": {"q": {"type": "string"}}}}
+
+    first = interrogator._generate_manual_payloads(tool_schema)
+    second = interrogator._generate_manual_payloads(tool_schema)
+
+    assert first == second
+    assert first is not second
+    assert first[0] is second[0]
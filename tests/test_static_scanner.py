@@ -2,6 +2,11 @@
 Test the static scanner module.
 """
 
+import asyncio
+import sys
+import time
+
+import pytest
 from pathlib import Path
 from src.inspector.static_scanner import StaticScanner
 
@@ -41,3 +46,303 @@ def test_check_python_requirements(tmp_path):
     permissions = scanner.check_permissions_manifest()
 
     assert "suspicious_dependencies" in permissions
+
+
+def test_check_node_dangerous_modules(tmp_path):
+    """Test dangerous Node.js modules are reported with their reason."""
+    (tmp_path / "package.json").write_text(
+        '{"dependencies": {"child_process": "^1.0.0", "lodash": "^4.0.0"}}'
+    )
+
+    scanner = StaticScanner(str(tmp_path))
+    permissions = scanner.check_permissions_manifest()
+
+    assert permissions["dangerous_permissions"] == ["child_process: Can execute system commands"]
+
+
+def test_suspicious_requirements_match_any_pattern(tmp_path):
+    """Test the suspicious-package automaton matches patterns as substrings."""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text(
+        "requests>=2.28.0\nparamiko>=3.0.0\nrich\ngoogle-cloud-storage==2.0\nBoto3\n"
+    )
+
+    scanner = StaticScanner(str(tmp_path))
+    permissions = scanner.check_permissions_manifest()
+
+    assert permissions["suspicious_dependencies"] == [
+        "requests",
+        "paramiko",
+        "google-cloud-storage",
+        "Boto3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_trivy_report_streaming(tmp_path):
+    """Test vulnerabilities are streamed out of a Trivy JSON report."""
+    import ijson
+
+    from src.inspector.static_scanner import SeverityLevel, TRIVY_VULNERABILITIES_PREFIX
+
+    report = tmp_path / "trivy-report.json"
+    report.write_text("""
+    {
+        "Results": [
+            {"Target": "package-lock.json", "Vulnerabilities": [
+                {"PkgName": "a", "VulnerabilityID": "CVE-1", "Severity": "CRITICAL"},
+                {"PkgName": "b", "VulnerabilityID": "CVE-2", "Severity": "HIGH"}
+            ]},
+            {"Target": "requirements.txt"},
+            {"Target": "poetry.lock", "Vulnerabilities": [
+                {"PkgName": "c", "VulnerabilityID": "CVE-3", "Severity": "LOW"}
+            ]}
+        ]
+    }
+    """)
+
+    async def records():
+        with open(report, "rb") as f:
+            for vuln in ijson.items(f, TRIVY_VULNERABILITIES_PREFIX):
+                yield vuln
+
+    scanner = StaticScanner(str(tmp_path))
+    result = await scanner._parse_trivy_results(records())
+
+    assert result.total_count == 3
+    assert result.critical_count == 1
+    assert result.high_count == 1
+    assert result.medium_count == 0
+    assert result.low_count == 1
+    assert result.vulnerabilities[0].severity == SeverityLevel.CRITICAL
+
+
+@pytest.mark.asyncio
+async def test_malformed_trivy_output_does_not_hang(tmp_path, monkeypatch):
+    """Test Trivy is stopped when its output is not valid JSON."""
+    import src.inspector.static_scanner as static_scanner
+
+    real_exec = static_scanner.asyncio.create_subprocess_exec
+    # Invalid JSON followed by more output than the pipe buffer can hold
+    script = "import sys; sys.stdout.write('{{' + 'x' * (1 << 22)); sys.stdout.flush()"
+
+    async def garbage_trivy(*cmd, **kwargs):
+        return await real_exec(sys.executable, "-c", script, **kwargs)
+
+    monkeypatch.setattr(static_scanner.asyncio, "create_subprocess_exec", garbage_trivy)
+
+    scanner = StaticScanner(str(tmp_path))
+    result = await asyncio.wait_for(scanner._run_trivy(), timeout=10)
+
+    assert result is None
+
+
+def test_check_python_pyproject(tmp_path):
+    """Test pyproject.toml dependency checking."""
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        "[project]\n"
+        'name = "demo"\n'
+        'dependencies = ["paramiko>=3.0", "requests[socks]==2.31.0", "rich"]\n'
+    )
+
+    scanner = StaticScanner(str(tmp_path))
+    permissions = scanner.check_permissions_manifest()
+
+    assert permissions["dangerous_permissions"] == [
+        "paramiko: SSH client - can connect remotely",
+        "requests: Can make HTTP requests",
+    ]
+
+
+def test_check_requirements_skips_comments_and_blanks(tmp_path):
+    """Test requirements.txt comments, blank lines and CRLF endings are ignored."""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_bytes(b"# network\r\n\r\n  boto3==1.0\r\n#httpx\nrich\n")
+
+    scanner = StaticScanner(str(tmp_path))
+    permissions = scanner.check_permissions_manifest()
+
+    assert permissions["suspicious_dependencies"] == ["boto3"]
+
+
+def test_prune_cache_evicts_least_recently_used(tmp_path):
+    """Test the scan cache keeps only the most recently used files."""
+    import os
+
+    from src.inspector.static_scanner import _prune_cache
+
+    for i in range(4):
+        entry = tmp_path / f"{i}.json"
+        entry.write_text("{}")
+        os.utime(entry, ns=(i * 10**9, i * 10**9))
+
+    _prune_cache(tmp_path, max_files=2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2.json", "3.json"]
+
+
+@pytest.mark.asyncio
+async def test_generate_sbom_uses_cache(tmp_path, monkeypatch):
+    """Test a cached SBOM is reused without running Trivy."""
+    import src.inspector.static_scanner as static_scanner
+
+    cache_dir = tmp_path / "cache"
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "package.json").write_text('{"name": "demo"}')
+    monkeypatch.setattr(static_scanner, "SCAN_CACHE_DIR", cache_dir)
+
+    scanner = StaticScanner(str(workspace))
+    cache_dir.mkdir()
+    (cache_dir / f"{scanner._tree_digest()}.cdx.json").write_text('{"bomFormat": "CycloneDX"}')
+
+    async def fail_exec(*args, **kwargs):
+        raise AssertionError("trivy should not run on a cache hit")
+
+    monkeypatch.setattr(static_scanner.asyncio, "create_subprocess_exec", fail_exec)
+
+    sbom = await scanner.generate_sbom()
+
+    assert Path(sbom).read_text() == '{"bomFormat": "CycloneDX"}'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_scan_and_sbom_hash_tree_once(tmp_path, monkeypatch):
+    """Test the concurrent Trivy scan and SBOM share a single tree walk."""
+    import src.inspector.static_scanner as static_scanner
+
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "package.json").write_text('{"name": "demo"}')
+    monkeypatch.setattr(static_scanner, "SCAN_CACHE_DIR", tmp_path / "cache")
+
+    walks = []
+    real_walk = static_scanner.os.walk
+
+    def counting_walk(*args, **kwargs):
+        walks.append(args[0])
+        # Keep the first walk running while the other caller asks for the digest
+        time.sleep(0.05)
+        return real_walk(*args, **kwargs)
+
+    async def missing_trivy(*args, **kwargs):
+        raise FileNotFoundError("trivy")
+
+    monkeypatch.setattr(static_scanner.os, "walk", counting_walk)
+    monkeypatch.setattr(static_scanner.asyncio, "create_subprocess_exec", missing_trivy)
+
+    scanner = StaticScanner(str(workspace))
+    await asyncio.gather(scanner.scan_with_trivy(), scanner.generate_sbom())
+
+    assert len(walks) == 1
+
+
+def _make_scan_result(path, vuln_id):
+    """Build a ScanResult with a single critical vulnerability."""
+    from src.inspector.static_scanner import ScanResult, SeverityLevel, Vulnerability
+
+    vulnerability = Vulnerability(
+        package_name="pkg",
+        installed_version="1.0.0",
+        vulnerability_id=vuln_id,
+        severity=SeverityLevel.CRITICAL,
+        title="",
+        description="",
+    )
+    return ScanResult(
+        path=str(path),
+        vulnerabilities=[vulnerability],
+        total_count=1,
+        critical_count=1,
+        high_count=0,
+        medium_count=0,
+        low_count=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_misses_for_different_trees(tmp_path, monkeypatch):
+    """Test workspaces without top-level manifests do not share cached results."""
+    import src.inspector.static_scanner as static_scanner
+
+    monkeypatch.setattr(static_scanner, "SCAN_CACHE_DIR", tmp_path / "cache")
+    runs = []
+
+    async def fake_run_trivy(self, keep_report=False):
+        runs.append(self.workspace_path)
+        return _make_scan_result(self.workspace_path, f"CVE-{len(runs)}")
+
+    monkeypatch.setattr(StaticScanner, "_run_trivy", fake_run_trivy)
+
+    clean = tmp_path / "clean"
+    (clean / "src").mkdir(parents=True)
+    (clean / "src" / "index.js").write_text("console.log('hi')")
+    malicious = tmp_path / "malicious"
+    (malicious / "vendor" / "evil").mkdir(parents=True)
+    (malicious / "vendor" / "evil" / "package.json").write_text('{"name": "evil"}')
+
+    first = await StaticScanner(str(clean)).scan_with_trivy()
+    second = await StaticScanner(str(malicious)).scan_with_trivy()
+
+    assert runs == [clean, malicious]
+    assert first.vulnerabilities[0].vulnerability_id == "CVE-1"
+    assert second.vulnerabilities[0].vulnerability_id == "CVE-2"
+
+
+@pytest.mark.asyncio
+async def test_scan_cache_hits_only_for_unchanged_tree(tmp_path, monkeypatch):
+    """Test an unchanged tree reuses cached results and a nested change does not."""
+    import src.inspector.static_scanner as static_scanner
+
+    monkeypatch.setattr(static_scanner, "SCAN_CACHE_DIR", tmp_path / "cache")
+    runs = []
+
+    async def fake_run_trivy(self, keep_report=False):
+        runs.append(self.workspace_path)
+        return _make_scan_result(self.workspace_path, f"CVE-{len(runs)}")
+
+    monkeypatch.setattr(StaticScanner, "_run_trivy", fake_run_trivy)
+
+    workspace = tmp_path / "workspace"
+    nested = workspace / "packages" / "server"
+    nested.mkdir(parents=True)
+    (nested / "requirements.txt").write_text("requests==2.0.0\n")
+
+    await StaticScanner(str(workspace)).scan_with_trivy()
+    cached = await StaticScanner(str(workspace)).scan_with_trivy()
+    assert len(runs) == 1
+    assert cached.vulnerabilities[0].vulnerability_id == "CVE-1"
+
+    (nested / "requirements.txt").write_text("requests==2.31.0\n")
+    rescanned = await StaticScanner(str(workspace)).scan_with_trivy()
+    assert len(runs) == 2
+    assert rescanned.vulnerabilities[0].vulnerability_id == "CVE-2"
+
+
+@pytest.mark.asyncio
+async def test_generate_sbom_cache_misses_for_different_trees(tmp_path, monkeypatch):
+    """Test an SBOM cached for one workspace is not reused for another."""
+    import src.inspector.static_scanner as static_scanner
+
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(static_scanner, "SCAN_CACHE_DIR", cache_dir)
+
+    first = tmp_path / "first"
+    (first / "lib").mkdir(parents=True)
+    (first / "lib" / "package.json").write_text('{"name": "first"}')
+    second = tmp_path / "second"
+    (second / "lib").mkdir(parents=True)
+    (second / "lib" / "package.json").write_text('{"name": "second"}')
+
+    first_scanner = StaticScanner(str(first))
+    (cache_dir / f"{first_scanner._tree_digest()}.cdx.json").write_text('{"bomFormat": "x"}')
+
+    async def missing_trivy(*args, **kwargs):
+        raise FileNotFoundError("trivy")
+
+    monkeypatch.setattr(static_scanner.asyncio, "create_subprocess_exec", missing_trivy)
+
+    assert await first_scanner.generate_sbom() is not None
+    assert await StaticScanner(str(second)).generate_sbom() is None